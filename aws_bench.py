@@ -0,0 +1,538 @@
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+import zlib
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from botocore.exceptions import ClientError
+
+# Rows are generated and written in chunks, so 10M-row files never sit in memory whole
+CHUNK_ROWS = 1_000_000
+# Span of the generated timestamps, ending now so the "last N days" tiles have data
+DATE_SPAN_DAYS = 3 * 365
+
+PLAN_DESCRIPTIONS = [
+    "BrainTap Monthly Subscription", "BrainTap Yearly Subscription",
+    "Legacy Monthly Plan", "Legacy Yearly Plan",
+    "Professional Monthly", "Professional Yearly",
+    "Promo Monthly", "promo yearly",
+]
+PRODUCT_DESCRIPTIONS = [
+    "Headset", "Chair", "Headphones", "Charging Cable", "Replacement Battery", "Accessory Shipping",
+]
+SESSION_TITLES = [
+    "Paid Partner (Unlimited)", "BT Paid Customer (Limited)", "Awaken Active Member", "Free Trial", "Basic Member",
+]
+# Session goals are numbered in production; goal_stats counts the users of each number
+SESSION_GOALS = [1, 2, 3]
+
+
+def parse_rows(text):
+    """Row count from a scale such as 10k, 1M or 2500000."""
+    text = text.strip().lower()
+    factor = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text[:-1] if factor > 1 else text) * factor)
+
+
+def pick(rng, values, n, p=None):
+    return np.asarray(values, dtype=object)[rng.choice(len(values), n, p=p)]
+
+
+def timestamps(rng, n, now):
+    """Random timestamps within the benchmark date span."""
+    seconds = rng.integers(0, DATE_SPAN_DAYS * 86400, n)
+    return pd.Series(now - pd.to_timedelta(seconds, unit="s"))
+
+
+def customer_numbers(rng, n, customers):
+    # Squared uniforms skew activity towards a core of repeat customers
+    return (rng.random(n) ** 2 * customers).astype(np.int64)
+
+
+def customer_ids(numbers):
+    return "cus_" + pd.Series(numbers).astype(str)
+
+
+def emails(numbers, prefix="user"):
+    domains = np.array(["gmail.com", "yahoo.com", "outlook.com", "icloud.com", "example.org"], dtype=object)
+    return prefix + pd.Series(numbers).astype(str) + "+" + pd.Series(numbers % 97).astype(str) + "@" + domains[numbers % len(domains)]
+
+
+def generate_revenue(rng, start, n, sizes, now):
+    numbers = customer_numbers(rng, n, sizes["customers"])
+    ids = customer_ids(numbers)
+    amounts = rng.gamma(2.0, 40.0, n).round(2)
+    return pd.DataFrame({
+        "created": timestamps(rng, n, now).dt.strftime("%d-%m-%Y"),
+        "customer_id": ids,
+        "email": emails(numbers),
+        "phone": "+1555" + pd.Series(rng.integers(1_000_000, 9_999_999, n)).astype(str),
+        "name": "Customer " + ids.str[4:],
+        "subscription": pick(rng, PLAN_DESCRIPTIONS, n),
+        "invoice_number": "INV-" + pd.Series(np.arange(start, start + n)).astype(str),
+        "description": pick(rng, PLAN_DESCRIPTIONS + PRODUCT_DESCRIPTIONS, n),
+        "quantity": rng.integers(1, 3, n),
+        "currency": pick(rng, ["usd", "eur", "gbp", "cad"], n, p=[0.7, 0.15, 0.1, 0.05]),
+        "line_item_amount": amounts,
+        "total_invoice_amount": amounts,
+        "discount": np.where(rng.random(n) < 0.1, (amounts * 0.2).round(2), 0.0),
+        "fee": (amounts * 0.029 + 0.3).round(2),
+        "tax": (amounts * 0.07).round(2),
+        "net_amount": (amounts * 0.9).round(2),
+    })
+
+
+def generate_customers(rng, start, n, sizes, now):
+    numbers = np.arange(start, start + n)
+    ids = customer_ids(numbers)
+    return pd.DataFrame({
+        "id": ids,
+        "name": "Customer " + ids.str[4:],
+        "email": emails(numbers),
+        "phone": "+1555" + pd.Series(rng.integers(1_000_000, 9_999_999, n)).astype(str),
+        "created": timestamps(rng, n, now),
+        "deleted": rng.random(n) < 0.05,
+        "shipping_address_city": pick(rng, ["Austin", "Denver", "Toronto", "London", "Berlin", "Sydney"], n),
+        "shipping_address_country": pick(rng, ["US", "CA", "GB", "DE", "AU"], n),
+    })
+
+
+def generate_subscriptions(rng, start, n, sizes, now):
+    created = timestamps(rng, n, now)
+    trial = rng.random(n) < 0.6
+    trial_start = created.where(trial)
+    return pd.DataFrame({
+        "id": "sub_" + pd.Series(np.arange(start, start + n)).astype(str),
+        "customer_id": customer_ids(customer_numbers(rng, n, sizes["customers"])),
+        "status": pick(rng, ["active", "trialing", "canceled", "past_due", "paused", "incomplete_expired"], n,
+                       p=[0.45, 0.15, 0.25, 0.07, 0.04, 0.04]),
+        "description": pick(rng, PLAN_DESCRIPTIONS, n),
+        "created": created,
+        "trial_start": trial_start,
+        "trial_end": trial_start + pd.to_timedelta(rng.choice([7, 14, 30], n), unit="D"),
+        "canceled_at": (created + pd.to_timedelta(rng.integers(1, 365, n), unit="D")).where(rng.random(n) < 0.3),
+    })
+
+
+def generate_payment(rng, start, n, sizes, now):
+    failed = rng.random(n) < 0.08
+    amounts = rng.gamma(2.0, 40.0, n).round(2)
+    return pd.DataFrame({
+        "id": "py_" + pd.Series(np.arange(start, start + n)).astype(str),
+        "customer_id": customer_ids(customer_numbers(rng, n, sizes["customers"])),
+        "amount": amounts,
+        "description": pick(rng, PLAN_DESCRIPTIONS + PRODUCT_DESCRIPTIONS, n),
+        "amount_refunded": np.where(rng.random(n) < 0.03, amounts, 0.0),
+        "balance_transaction_id": "txn_" + pd.Series(np.arange(start, start + n)).astype(str),
+        "calculated_statement_descriptor": "BRAINTAP",
+        "currency": pick(rng, ["usd", "eur", "gbp", "cad"], n, p=[0.7, 0.15, 0.1, 0.05]),
+        "status": np.where(failed, "failed", "succeeded"),
+        "refunded": rng.random(n) < 0.03,
+        "failure_code": pd.Series(pick(rng, ["card_declined", "expired_card", "insufficient_funds"], n)).where(failed),
+        "created_date": timestamps(rng, n, now),
+    })
+
+
+def generate_financial(rng, start, n, sizes, now):
+    months = pd.date_range(end=now, periods=n // 3, freq="MS")
+    frame = pd.DataFrame({
+        "month": np.repeat(months.strftime("%Y-%m-%d"), 3),
+        "currency": np.tile(["usd", "eur", "gbp"], len(months)),
+    })
+    sales = rng.gamma(5.0, 20_000.0, len(frame)).round(2)
+    refunds = (sales * rng.uniform(0.01, 0.05, len(frame))).round(2)
+    frame["total_sales"] = sales
+    frame["total_refunds"] = refunds
+    frame["total_payouts"] = (sales * 0.85).round(2)
+    frame["net_profit_loss"] = (sales - refunds - sales * 0.7).round(2)
+    return frame
+
+
+def generate_customer_metadata(rng, start, n, sizes, now):
+    return pd.DataFrame({
+        "customer_id": customer_ids(customer_numbers(rng, n, sizes["customers"])),
+        "key": pick(rng, ["source", "referrer", "campaign"], n),
+        "value": pick(rng, ["google", "facebook", "podcast", "tv", "friend", "partner"], n),
+    })
+
+
+def generate_charges(rng, start, n, sizes, now):
+    return pd.DataFrame({
+        "charge_id": "ch_" + pd.Series(np.arange(start, start + n)).astype(str),
+        "charge_amount": rng.gamma(2.0, 40.0, n).round(2),
+        "charge_description": pick(rng, ["Subscription creation", "Subscription update", "Payment for invoice"], n),
+        "charge_created": timestamps(rng, n, now),
+    })
+
+
+def generate_sessions(rng, start, n, sizes, now):
+    started = timestamps(rng, n, now)
+    completed = pd.Series(rng.integers(1, 61, n).astype(float)).where(rng.random(n) > 0.1)
+    return pd.DataFrame({
+        "tap_session_started_at": started,
+        "tap_session_id": rng.integers(1, 5_000, n),
+        "completed_minutes": completed,
+        "title": pick(rng, SESSION_TITLES, n, p=[0.2, 0.35, 0.05, 0.25, 0.15]),
+        "userid": customer_numbers(rng, n, sizes["users"]) + 1,
+        "user_notifications_enabled": rng.random(n) < 0.6,
+        "preferred_time": pick(rng, ["morning", "afternoon", "evening", "night"], n),
+        "email": emails(rng.integers(1, sizes["users"] + 1, n), prefix="member"),
+        "user_session_goals": pd.Series(pick(rng, SESSION_GOALS, n, p=[0.02, 0.95, 0.03]), dtype=float).where(rng.random(n) > 0.7),
+        "twenty_five_percent_completed_at": (started + pd.to_timedelta(rng.integers(60, 900, n), unit="s")).where(rng.random(n) < 0.5),
+        "author": pick(rng, [f"Author {i}" for i in range(40)], n),
+        "narrator": pick(rng, [f"Narrator {i}" for i in range(15)], n),
+    })
+
+
+# Dataset name -> (generator, rows as a fraction of the benchmark scale, or a fixed count)
+GENERATORS = {
+    "revenue": (generate_revenue, 1.0),
+    "customers": (generate_customers, 1 / 20),
+    "subscriptions": (generate_subscriptions, 1 / 8),
+    "payment": (generate_payment, 1.0),
+    "financial": (generate_financial, 36 * 3),
+    "customer_metadata": (generate_customer_metadata, 1 / 15),
+    "charges": (generate_charges, 1.0),
+    "summary": (generate_sessions, 1.0),
+    "users": (generate_sessions, 1.0),
+    "goals": (generate_sessions, 1.0),
+    "authors": (generate_sessions, 1.0),
+}
+
+
+def dashboards(s3_client=None):
+    from aws_braintap import BraninTapApp
+    from aws_stripe import Dashboard
+    return [Dashboard(s3_client), BraninTapApp(s3_client)]
+
+
+def generate(root, rows, seed=0):
+    """Write every file of every dashboard's s3_config under root/<bucket>/<key>."""
+    now = pd.Timestamp.now().floor("s")
+    sizes = {"customers": max(int(rows / 20), 100), "users": max(int(rows / 50), 100)}
+    for dashboard in dashboards(LocalS3Client(root)):
+        bucket = dashboard.s3_config["bucket_name"]
+        for name, key in dashboard.s3_config["files"].items():
+            build, scale = GENERATORS[name]
+            total = int(scale) if scale > 1 else max(int(rows * scale), 100)
+            path = os.path.join(root, bucket, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            started = time.perf_counter()
+            with open(path, "w", newline="") as handle:
+                for start in range(0, total, CHUNK_ROWS):
+                    count = min(CHUNK_ROWS, total - start)
+                    rng = np.random.default_rng([seed, zlib.crc32(name.encode()), start])
+                    build(rng, start, count, sizes, now).to_csv(handle, index=False, header=start == 0)
+            print(f"{path}: {total:,} rows in {time.perf_counter() - started:.1f}s")
+
+
+class LocalBody:
+    """The slice of a StreamingBody the loaders use, over a local file."""
+
+    def __init__(self, path, start=0, length=None):
+        self._handle = open(path, "rb")
+        self._handle.seek(start)
+        self._remaining = os.path.getsize(path) - start if length is None else length
+
+    def read(self, amt=None):
+        if not self._remaining:
+            return b""
+        size = self._remaining if amt is None else min(amt, self._remaining)
+        data = self._handle.read(size)
+        self._remaining -= len(data)
+        if not self._remaining:
+            self._handle.close()
+        return data
+
+    def iter_chunks(self, chunk_size=1024):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        self._handle.close()
+
+
+class LocalS3Client:
+    """
+    Filesystem-backed stand-in for the boto3 S3 client: objects live at
+    root/<bucket>/<key> and user metadata in a JSON sidecar under root/.metadata.
+    Supports what the dashboards call (conditional and ranged GETs, HEAD, PUT,
+    listing) with S3's error codes.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, bucket, key):
+        return os.path.join(self.root, bucket, key)
+
+    def _metadata_path(self, bucket, key):
+        return os.path.join(self.root, ".metadata", bucket, key + ".json")
+
+    def _error(self, code, operation):
+        return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+    def _stat(self, bucket, key, operation, missing_code):
+        try:
+            stat = os.stat(self._path(bucket, key))
+        except FileNotFoundError:
+            raise self._error(missing_code, operation) from None
+        return {
+            "ETag": f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+            "ContentLength": stat.st_size,
+            "LastModified": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+        }
+
+    def head_object(self, Bucket, Key, **kwargs):
+        head = self._stat(Bucket, Key, "HeadObject", "404")
+        try:
+            with open(self._metadata_path(Bucket, Key)) as handle:
+                head["Metadata"] = json.load(handle)
+        except FileNotFoundError:
+            head["Metadata"] = {}
+        return head
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None, IfMatch=None, Range=None, **kwargs):
+        head = self.head_object(Bucket, Key)
+        if IfMatch is not None and IfMatch != head["ETag"]:
+            raise self._error("PreconditionFailed", "GetObject")
+        if IfNoneMatch is not None and IfNoneMatch == head["ETag"]:
+            raise self._error("304", "GetObject")
+        start, length = 0, head["ContentLength"]
+        if Range is not None:
+            first, _, last = Range.split("=", 1)[1].partition("-")
+            start = int(first)
+            end = min(int(last), head["ContentLength"] - 1) if last else head["ContentLength"] - 1
+            length = max(end - start + 1, 0)
+            head["ContentRange"] = f"bytes {start}-{end}/{head['ContentLength']}"
+        head["ContentLength"] = length
+        head["Body"] = LocalBody(self._path(Bucket, Key), start, length)
+        return head
+
+    def put_object(self, Bucket, Key, Body, Metadata=None, **kwargs):
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as handle:
+            handle.write(Body if isinstance(Body, bytes) else Body.read())
+        metadata_path = self._metadata_path(Bucket, Key)
+        os.makedirs(os.path.dirname(metadata_path), exist_ok=True)
+        with open(metadata_path, "w") as handle:
+            json.dump(Metadata or {}, handle)
+        return {"ETag": self.head_object(Bucket, Key)["ETag"]}
+
+    def list_objects_v2(self, Bucket, Prefix="", **kwargs):
+        bucket_root = os.path.join(self.root, Bucket)
+        contents = []
+        for directory, _, files in os.walk(bucket_root):
+            for file in files:
+                key = os.path.relpath(os.path.join(directory, file), bucket_root).replace(os.sep, "/")
+                if key.startswith(Prefix):
+                    head = self._stat(Bucket, key, "ListObjectsV2", "NoSuchKey")
+                    contents.append({"Key": key, "Size": head["ContentLength"], "ETag": head["ETag"],
+                                     "LastModified": head["LastModified"]})
+        contents.sort(key=lambda item: item["Key"])
+        return {"Contents": contents, "KeyCount": len(contents), "IsTruncated": False}
+
+
+# Page methods of each dashboard, in menu order
+PAGES = {
+    "Dashboard": ["Summary", "Revenue", "Customers", "Subscriptions", "Payment", "financial"],
+    "BraninTapApp": ["page_summary", "page_users", "page_goals", "page_authors"],
+}
+# Streamlit calls that serialize a chart, table or metric for the browser
+RENDER_CALLS = ["plotly_chart", "altair_chart", "vega_lite_chart", "dataframe", "table", "metric", "bar_chart", "line_chart"]
+
+
+class PageTimer:
+    """Accumulates the time spent in wrapped calls, counting nested calls once."""
+
+    def __init__(self):
+        self.totals = {"load": 0.0, "render": 0.0}
+        self._depth = 0
+
+    def reset(self):
+        self.totals = dict.fromkeys(self.totals, 0.0)
+
+    def wrap(self, phase, func):
+        def timed(*args, **kwargs):
+            self._depth += 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._depth -= 1
+                if not self._depth:
+                    self.totals[phase] += time.perf_counter() - started
+        return timed
+
+
+def stub_streamlit(timer):
+    """
+    Run Streamlit headless: element calls keep their bare-mode behaviour (widgets
+    return their defaults, charts are still serialized) but are timed as render.
+    """
+    import streamlit as st
+    from streamlit import config, logger
+    from streamlit.delta_generator import DeltaGenerator
+
+    # Bare mode warns on every element call made without a running app; the config
+    # is parsed first, as parsing it resets the log level
+    config.get_config_options()
+    logger.set_log_level(logging.ERROR)
+    warnings.filterwarnings("ignore")
+    for name in RENDER_CALLS:
+        method = getattr(DeltaGenerator, name)
+        setattr(DeltaGenerator, name, timer.wrap("render", method))
+        setattr(st, name, timer.wrap("render", getattr(st, name)))
+
+
+def reset_caches():
+    from aws_data import dataset_cache, derived_cache
+    dataset_cache.invalidate()
+    derived_cache.clear()
+
+
+def run_page(app, page, timer, traced=False):
+    """Run one page method; returns (total seconds, peak traced bytes or None)."""
+    timer.reset()
+    if traced:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        getattr(app, page)()
+    finally:
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if traced else None
+        if traced:
+            tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(root, pages=None, repeat=3):
+    """
+    Benchmark every page against the data under root.
+
+    Each page runs once on cold caches, `repeat` times warm (medians are
+    reported), and once more cold under tracemalloc for its peak memory, which
+    is kept out of the timings because tracing slows allocation down.
+    """
+    timer = PageTimer()
+    stub_streamlit(timer)
+    s3_client = LocalS3Client(root)
+    results = []
+    for app in dashboards(s3_client):
+        app.load_page_data = timer.wrap("load", app.load_page_data)
+        app.load_data_from_s3 = timer.wrap("load", app.load_data_from_s3)
+        for page in PAGES[type(app).__name__]:
+            if pages and page not in pages:
+                continue
+            result = {"page": page}
+            try:
+                reset_caches()
+                elapsed, _ = run_page(app, page, timer)
+                result["cold_load"] = timer.totals["load"]
+                result["cold_total"] = elapsed
+                warm = []
+                for _ in range(repeat):
+                    elapsed, _ = run_page(app, page, timer)
+                    warm.append((timer.totals["load"], timer.totals["render"], elapsed))
+                load, render, total = (statistics.median(values) for values in zip(*warm))
+                result.update(load=load, transform=total - load - render, render=render, total=total)
+                reset_caches()
+                result["peak_mib"] = run_page(app, page, timer, traced=True)[1] / 2 ** 20
+            except Exception as error:
+                result["error"] = f"{type(error).__name__}: {error}"
+            results.append(result)
+    return results
+
+
+def import_times(module):
+    """
+    Import time of module in a fresh interpreter, from python -X importtime.
+
+    Returns its cumulative seconds and (name, cumulative seconds) of every import
+    it triggered directly, slowest first. Modules already imported by Python's
+    own startup are not counted.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=root, capture_output=True, text=True, check=True).stderr
+    children = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        seconds = int(cumulative) / 1e6
+        if depth == 0 and name.strip() == module:
+            return seconds, sorted(children, key=lambda child: child[1], reverse=True)
+        if depth == 0:
+            children = []
+        elif depth == 1:
+            children.append((name.strip(), seconds))
+    raise RuntimeError(f"{module} was not imported")
+
+
+def report_imports(modules, top=10):
+    for module in modules:
+        total, children = import_times(module)
+        print(f"{module:<32}{total:>10.3f}s")
+        for name, seconds in children[:top]:
+            print(f"  {name:<30}{seconds:>10.3f}s")
+
+
+def report(results):
+    columns = ["cold_load", "cold_total", "load", "transform", "render", "total", "peak_mib"]
+    print(f"{'page':<16}" + "".join(f"{column:>12}" for column in columns))
+    for result in results:
+        if "error" in result:
+            print(f"{result['page']:<16}  FAILED {result['error']}")
+            continue
+        print(f"{result['page']:<16}" + "".join(f"{result[column]:>12.3f}" for column in columns))
+
+
+if __name__ == "__main__":
+    # python aws_bench.py generate --rows 1M [--snapshot parquet]
+    # python aws_bench.py run [--pages Summary page_users] [--repeat 3] [--json results.json]
+    # python aws_bench.py imports [--modules aws_app aws_stripe] [--top 10]
+    parser = argparse.ArgumentParser(description="Dashboard benchmarks on synthetic data")
+    parser.add_argument("--data", default="bench_data", help="Root directory of the local S3 stand-in")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate_command = commands.add_parser("generate", help="Write synthetic versions of every dataset")
+    generate_command.add_argument("--rows", type=parse_rows, default=parse_rows("10k"), help="Scale, e.g. 10k, 1M, 10M")
+    generate_command.add_argument("--seed", type=int, default=0)
+    generate_command.add_argument("--snapshot", choices=["parquet", "feather"], help="Also write columnar snapshots")
+    run_command = commands.add_parser("run", help="Time every page headless against the generated data")
+    run_command.add_argument("--pages", nargs="*", help="Page methods to run (default: all)")
+    run_command.add_argument("--repeat", type=int, default=3, help="Warm runs per page")
+    run_command.add_argument("--json", help="Also write the results to this file")
+    imports_command = commands.add_parser("imports", help="Time the cold import of the app modules")
+    imports_command.add_argument("--modules", nargs="*", default=["aws_app", "aws_stripe", "aws_braintap"])
+    imports_command.add_argument("--top", type=int, default=10, help="Slowest direct imports shown per module")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate(args.data, args.rows, args.seed)
+        if args.snapshot:
+            from aws_data import convert_all
+            convert_all(LocalS3Client(args.data), dashboards(LocalS3Client(args.data)), args.snapshot)
+    elif args.command == "run":
+        results = run(args.data, args.pages, args.repeat)
+        report(results)
+        if args.json:
+            with open(args.json, "w") as handle:
+                json.dump(results, handle, indent=2)
+    elif args.command == "imports":
+        report_imports(args.modules, args.top)
@@ -0,0 +1,119 @@
+import os
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from aws_data import memoize
+
+# Most points (bars, markers, line vertices) a chart sends to the browser per figure
+CHART_MAX_POINTS = int(os.environ.get("DASHBOARD_CHART_POINTS", 1000))
+# Time buckets charts fall back to, finest first
+TIME_BUCKETS = ["D", "W", "M", "Q", "Y"]
+
+
+def time_bucket(start, end, max_points=CHART_MAX_POINTS, buckets=TIME_BUCKETS):
+    """The finest period of `buckets` that splits start..end into at most max_points periods."""
+    for freq in buckets:
+        if len(pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq=freq)) <= max_points:
+            return freq
+    return buckets[-1]
+
+
+def bucketed(frame, x, y, max_points=CHART_MAX_POINTS, by=None):
+    """
+    Bar chart rows: frame itself when it fits the point budget, otherwise the
+    `y` column(s) summed per time bucket of `x` (split by the `by` column), with
+    x set to the start of each bucket.
+    """
+    if len(frame) <= max_points:
+        return frame
+    dates = pd.to_datetime(frame[x])
+    if by is not None:
+        max_points = max(1, max_points // max(1, frame[by].nunique()))
+    freq = time_bucket(dates.min(), dates.max(), max_points)
+    keys = [dates.dt.to_period(freq).dt.start_time.rename(x)] + ([frame[by]] if by is not None else [])
+    return frame.groupby(keys, observed=True, sort=True)[y].sum().reset_index()
+
+
+def lttb(x, y, threshold):
+    """
+    Positions of `threshold` points that keep the shape of the (x, y) line,
+    picked with Largest-Triangle-Three-Buckets: the first and last points, and
+    from each bucket in between the point spanning the largest triangle with
+    the point kept before it and the average of the next bucket.
+    """
+    count = len(y)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, count - 1, threshold - 1).astype(int)
+    picked = [0]
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        after = slice(stop, edges[bucket + 2] if bucket + 2 < len(edges) else count)
+        next_x, next_y = x[after].mean(), y[after].mean()
+        last = picked[-1]
+        areas = np.abs((x[last] - next_x) * (y[start:stop] - y[last]) - (x[last] - x[start:stop]) * (next_y - y[last]))
+        picked.append(start + int(np.argmax(areas)))
+    picked.append(count - 1)
+    return np.asarray(picked)
+
+
+def downsampled(frame, x, y, max_points=CHART_MAX_POINTS, by=None):
+    """
+    Line chart rows: frame itself when it fits the point budget, otherwise each
+    line (one per `by` value) cut down to its share of max_points with lttb().
+    Rows must be ordered by x within each line.
+    """
+    if len(frame) <= max_points:
+        return frame
+    lines = [frame] if by is None else [rows for _, rows in frame.groupby(by, observed=True, sort=False)]
+    share = max(3, max_points // len(lines))
+    kept = []
+    for rows in lines:
+        positions = rows[x]
+        if not pd.api.types.is_numeric_dtype(positions):
+            positions = pd.to_datetime(positions).astype("int64")
+        kept.append(rows.iloc[lttb(positions, rows[y], share)])
+    return pd.concat(kept)
+
+
+def figure(key, frames, build, *args, **kwargs):
+    """
+    build(*args, **kwargs) (a Plotly figure or a chart spec) cached under key,
+    e.g. (page, chart id) + filter values, and the versions of frames, the
+    datasets the chart is drawn from. Reruns and other sessions showing the same
+    chart reuse it without rebuilding or re-serializing its data.
+    """
+    return memoize(("figure",) + tuple(key), frames, lambda: build(*args, **kwargs))
+
+
+def arrow_table(frame):
+    """frame as an Arrow table, converted once and kept with the cached spec."""
+    return pa.Table.from_pandas(frame, preserve_index=False)
+
+
+def bar_chart_spec(frame, category, value, category_title, value_title, sort=None, horizontal=False):
+    """
+    Vega-Lite spec of the dashboards' 600x400 bar chart of `value` per
+    `category`, for st.vega_lite_chart. The category axis is x, or y when
+    horizontal, and is sorted by value, largest first, unless `sort` says
+    otherwise. The rows are attached as an Arrow table, which Streamlit
+    serializes itself, instead of JSON records.
+    """
+    sort = sort or ('-x' if horizontal else '-y')
+    category_axis = dict(shorthand=f'{category}:N', title=category_title, sort=sort)
+    value_axis = dict(shorthand=f'{value}:Q', title=value_title)
+    if horizontal:
+        x, y = alt.X(**value_axis), alt.Y(**category_axis)
+    else:
+        x, y = alt.X(**category_axis), alt.Y(**value_axis)
+    chart = alt.Chart(alt.Data(name='rows')).mark_bar().encode(
+        x=x, y=y, tooltip=[f'{category}:N', f'{value}:Q']
+    ).properties(width=600, height=400).configure_axis(labelAngle=0)
+    spec = chart.to_dict()
+    spec['datasets'] = {'rows': arrow_table(frame)}
+    return spec
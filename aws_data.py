@@ -0,0 +1,969 @@
+import argparse
+import hashlib
+import io
+import logging
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import boto3
+import numpy as np
+import pandas as pd
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# Cache settings, overridable from the environment of the Streamlit server
+CACHE_TTL_SECONDS = float(os.environ.get("DASHBOARD_CACHE_TTL", 300))
+CACHE_MAX_BYTES = int(os.environ.get("DASHBOARD_CACHE_MAX_BYTES", 1024 ** 3))
+# Byte budget of the values derived from datasets: indexes, rollups, KPI records, figures
+DERIVED_MAX_BYTES = int(os.environ.get("DASHBOARD_DERIVED_MAX_BYTES", 256 * 1024 ** 2))
+# Parallel S3 requests per process; the client connection pool is sized to match
+S3_MAX_CONNECTIONS = int(os.environ.get("DASHBOARD_S3_MAX_CONNECTIONS", 16))
+# Rows parsed and typed at a time while streaming a CSV body
+CSV_CHUNK_ROWS = int(os.environ.get("DASHBOARD_CSV_CHUNK_ROWS", 250_000))
+# Seconds between background refresh passes; kept under the TTL so pages never
+# revalidate themselves, 0 disables the refresh worker
+REFRESH_INTERVAL_SECONDS = float(os.environ.get("DASHBOARD_REFRESH_INTERVAL", 60))
+
+# Bytes before the end of an append-only CSV re-read and checksummed on every
+# incremental load, to tell an append from a rewrite
+APPEND_CHECK_BYTES = 4096
+# Seconds an append-only CSV is extended incrementally before it is parsed in full
+# again, so an edit to an earlier row that the tail checksum cannot see is picked up
+APPEND_FULL_RELOAD_SECONDS = float(os.environ.get("DASHBOARD_APPEND_FULL_RELOAD", 3600))
+
+log = logging.getLogger(__name__)
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+_prefetch_pool = ThreadPoolExecutor(max_workers=S3_MAX_CONNECTIONS, thread_name_prefix="s3-prefetch")
+
+
+def get_s3_client():
+    """Return the S3 client shared by every session and prefetch thread."""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is None:
+            _s3_client = boto3.client('s3', config=Config(
+                max_pool_connections=S3_MAX_CONNECTIONS,
+                retries={"max_attempts": 3, "mode": "adaptive"},
+                tcp_keepalive=True,
+            ))
+        return _s3_client
+
+
+class BodyStream(io.RawIOBase):
+    """Raw binary file over a StreamingBody, so parsers pull the object from the socket as they go."""
+
+    def __init__(self, body):
+        self.body = body
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.body.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def concat_chunks(chunks):
+    """Concatenate frames parsed separately, keeping categorical columns categorical over all their values."""
+    if len(chunks) == 1:
+        return chunks[0]
+    if not chunks:
+        return pd.DataFrame()
+    for column in chunks[0].columns:
+        if all(isinstance(chunk[column].dtype, pd.CategoricalDtype) for chunk in chunks):
+            categories = chunks[0][column].cat.categories
+            for chunk in chunks[1:]:
+                categories = categories.union(chunk[column].cat.categories)
+            for chunk in chunks:
+                chunk[column] = chunk[column].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def projection(columns):
+    """usecols for read_csv: the wanted columns that exist, or all of them when columns is None."""
+    return None if columns is None else (lambda column: column in columns)
+
+
+def read_csv_response(response, schema=None, columns=None, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Parse the body of an S3 get_object response as CSV, streaming it.
+
+    The body is parsed in chunks of chunk_rows rows as it arrives, and each chunk
+    gets the schema's column types (type_columns) before the next one is read, so
+    neither the raw bytes nor a decoded copy of the whole object is ever held and
+    peak memory stays near the size of the typed frame. Only `columns` are
+    parsed when given.
+    """
+    stream = io.BufferedReader(BodyStream(response['Body']), buffer_size=1 << 20)
+    with pd.read_csv(stream, chunksize=chunk_rows, usecols=projection(columns)) as reader:
+        chunks = [type_columns(chunk, schema) for chunk in reader]
+    return concat_chunks(chunks)
+
+
+class BodyEdges:
+    """
+    Wraps a StreamingBody, remembering the first line (the CSV header) and
+    the last `size` bytes of what is read through it, plus the byte count.
+    """
+
+    def __init__(self, body, size=APPEND_CHECK_BYTES):
+        self.body = body
+        self.size = size
+        self.header = b""
+        self.tail = b""
+        self.length = 0
+
+    def read(self, amt=None):
+        data = self.body.read() if amt is None else self.body.read(amt)
+        if not self.header.endswith(b"\n"):
+            end = data.find(b"\n")
+            self.header += data if end < 0 else data[:end + 1]
+        self.tail = data[-self.size:] if len(data) >= self.size else (self.tail + data)[-self.size:]
+        self.length += len(data)
+        return data
+
+    def iter_chunks(self, chunk_size=1024):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def read_parquet_response(response, schema=None, columns=None):
+    """Parse the body of an S3 get_object response as a Parquet snapshot (typed when written)."""
+    buffer = BytesIO(response['Body'].read())
+    if columns is not None:
+        columns = [column for column in pq.read_schema(buffer).names if column in columns]
+    return pd.read_parquet(buffer, columns=columns)
+
+
+def read_feather_response(response, schema=None, columns=None):
+    """Parse the body of an S3 get_object response as a Feather snapshot (typed when written)."""
+    buffer = BytesIO(response['Body'].read())
+    if columns is not None:
+        columns = [column for column in ipc.open_file(buffer).schema.names if column in columns]
+    return pd.read_feather(buffer, columns=columns)
+
+
+# Columnar siblings looked up before falling back to the CSV itself, e.g. summary.csv.parquet
+SNAPSHOT_FORMATS = {
+    "parquet": read_parquet_response,
+    "feather": read_feather_response,
+}
+# User metadata written on every snapshot: the ETag of the CSV it was converted from
+SNAPSHOT_SOURCE_META = "source-etag"
+
+
+# Substring rules behind the derived plan columns, tried in order: first match wins,
+# so every description gets exactly one label per column (test_plan_classification
+# pins the labels of representative plan names)
+PLAN_CLASSIFIERS = {
+    "plan_family": ([
+        ("legacy", "Legacy"),
+        ("partner", "Professional"),
+        ("promo", "Promo|promo"),
+        ("retail", "BrainTap"),
+    ], "other"),
+    "billing_period": ([
+        ("monthly", "Monthly|month|Month"),
+        ("yearly", "Yearly|year|Year"),
+    ], "none"),
+    "item_kind": ([
+        ("accessory", "Charging Cable|Replacement Battery|Accessory Shipping"),
+        ("product", "Headset|Chair|Headphones"),
+        ("subscription", "(?i)subscription"),
+    ], "other"),
+}
+
+
+def classify_plans(values):
+    """
+    Derive plan_family, billing_period and item_kind categoricals from a
+    description-like column.
+
+    Descriptions have few distinct values, so the patterns only run over those
+    and the labels are mapped back to the rows by code. Missing values stay missing.
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(np.asarray(uniques, dtype=object)).astype(str)
+    derived = {}
+    for name, (rules, default) in PLAN_CLASSIFIERS.items():
+        labels = [label for label, _ in rules] + [default]
+        label_codes = np.full(len(uniques), len(rules))
+        for position in reversed(range(len(rules))):
+            label_codes[uniques.str.contains(rules[position][1]).to_numpy()] = position
+        row_codes = np.where(codes >= 0, label_codes[codes], -1)
+        derived[name] = pd.Categorical.from_codes(row_codes, categories=labels)
+    return derived
+
+
+def type_columns(frame, schema):
+    """
+    The per-column part of apply_schema: "dtypes", "dates" and "categories".
+    Each row is typed on its own, so this runs on every chunk of a streamed parse.
+    """
+    if not schema:
+        return frame
+    for column, dtype in schema.get("dtypes", {}).items():
+        if column in frame and frame[column].dtype != dtype:
+            frame[column] = frame[column].astype(dtype)
+    for column, date_format in schema.get("dates", {}).items():
+        if column in frame and not pd.api.types.is_datetime64_any_dtype(frame[column]):
+            frame[column] = pd.to_datetime(frame[column], format=date_format, errors='coerce')
+    for column in schema.get("categories", []):
+        if column in frame and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype('category')
+    return frame
+
+
+def apply_schema(frame, schema):
+    """
+    Type a freshly parsed frame as its schema declares, once per load.
+
+    A schema is a dict with optional "dtypes" (column -> dtype), "dates"
+    (column -> strptime format, or None to infer), "categories" (low
+    cardinality columns stored as category) and "classify" (description-like
+    columns to derive <column>_plan_family/_billing_period/_item_kind from) and
+    "sort_by" (the primary timestamp column the rows are kept sorted by, so date
+    filters can binary search it). Columns missing from the frame are skipped,
+    and already typed columns (e.g. from a snapshot) are left as they are.
+    "append_only" marks CSVs that only ever grow at the end, which the cache
+    then revalidates by reading the new bytes only (and in full every
+    APPEND_FULL_RELOAD_SECONDS).
+    """
+    if not schema:
+        return frame
+    frame = type_columns(frame, schema)
+    for column in schema.get("classify", []):
+        if column in frame and f"{column}_item_kind" not in frame:
+            for name, values in classify_plans(frame[column]).items():
+                frame[f"{column}_{name}"] = pd.Series(values, index=frame.index)
+    sort_by = schema.get("sort_by")
+    if sort_by in frame:
+        present = frame[sort_by].notna()
+        # Snapshots are written sorted already: missing dates last, the rest ascending
+        if not (present.is_monotonic_decreasing and frame.loc[present, sort_by].is_monotonic_increasing):
+            frame = frame.sort_values(sort_by, kind='stable', na_position='last', ignore_index=True)
+        frame.attrs["sorted_by"] = sort_by
+    return frame
+
+
+def append_rows(frame, rows, schema=None):
+    """
+    Add rows parsed and typed on their own (an appended CSV tail, new partitions)
+    to a typed frame, as apply_schema would have typed the whole file: category
+    sets are merged and the sort_by order restored.
+
+    Returns the combined frame and the new rows cast like it, or None when the
+    new rows do not fit the frame's columns or dtypes and everything has to be
+    reloaded instead.
+    """
+    if list(rows.columns) != list(frame.columns):
+        return None
+    frame, rows = frame.copy(deep=False), rows.copy(deep=False)
+    for column in frame.columns:
+        old, new = frame[column], rows[column]
+        if isinstance(old.dtype, pd.CategoricalDtype):
+            new = new if isinstance(new.dtype, pd.CategoricalDtype) else new.astype('category')
+            categories = old.cat.categories
+            if not new.cat.categories.isin(categories).all():
+                categories = categories.union(new.cat.categories)
+                frame[column] = old.cat.set_categories(categories)
+            rows[column] = new.cat.set_categories(categories)
+        elif old.dtype != new.dtype:
+            # A full parse would have inferred another dtype, e.g. missing values in an int column
+            if old.dtype.kind == 'b' and new.isna().any():
+                return None
+            try:
+                rows[column] = new.astype(old.dtype)
+            except (TypeError, ValueError):
+                return None
+    combined = pd.concat([frame, rows], ignore_index=True)
+    sort_by = (schema or {}).get("sort_by")
+    if sort_by:
+        combined = apply_schema(combined, {"sort_by": sort_by})
+    return combined, rows
+
+
+def list_csv_objects(s3_client, bucket, prefix):
+    """ETags of the .csv objects under prefix by key, following continuation tokens."""
+    objects, token = {}, None
+    while True:
+        kwargs = {"ContinuationToken": token} if token else {}
+        response = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix, **kwargs)
+        for item in response.get("Contents", []):
+            if item["Key"].endswith(".csv"):
+                objects[item["Key"]] = item["ETag"]
+        if not response.get("IsTruncated"):
+            return objects
+        token = response["NextContinuationToken"]
+
+
+def is_missing(error):
+    return error.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound')
+
+
+class CacheEntry:
+    def __init__(self, frame, etag):
+        self.frame = frame
+        self.etag = etag
+        self.nbytes = int(frame.memory_usage(deep=True).sum())
+        self.checked_at = time.monotonic()
+        # When the whole object was last parsed; incremental loads keep it
+        self.loaded_at = self.checked_at
+        # Append-only CSVs: header line, object length and checksum of its last bytes
+        self.header = None
+        self.length = None
+        self.tail_size = None
+        self.tail_crc = None
+        # Partitioned prefixes: ETag of every object loaded, by key
+        self.parts = None
+        # Source columns parsed (a frozenset), None when all of them were
+        self.columns = None
+
+    def covers(self, columns):
+        """Whether the entry holds every column of a projection (None asks for all)."""
+        return self.columns is None or (columns is not None and columns <= self.columns)
+
+    def remember_end(self, header, length, tail):
+        """Record where an append-only CSV ended; appends are only detected after a complete row."""
+        if header.endswith(b"\n") and tail.endswith(b"\n"):
+            self.header, self.length = header, length
+            self.tail_size, self.tail_crc = len(tail), zlib.crc32(tail)
+
+
+class DatasetCache:
+    """
+    Process-wide cache of parsed S3 datasets, shared by every Streamlit session.
+
+    Entries are keyed by (bucket, key). Once an entry is older than the TTL it is
+    revalidated with a conditional GET on its ETag, so an unchanged object costs a
+    single 304 round trip instead of a full download and parse. The total size of
+    the cached frames is kept under a byte budget by evicting the least recently
+    used entries.
+
+    Loads can ask for a subset of the columns. An entry keeps the columns it was
+    parsed with and is widened (reloaded with the union) the first time a load
+    asks for a column it lacks, so narrow pages never parse or hold wide frames.
+    """
+
+    def __init__(self, ttl=CACHE_TTL_SECONDS, max_bytes=CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        # Latest incremental load per key: (previous version, new version, new rows)
+        self._appends = {}
+
+    def _key_lock(self, cache_key):
+        with self._lock:
+            return self._key_locks.setdefault(cache_key, threading.Lock())
+
+    def _fresh(self, cache_key, columns=None):
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and time.monotonic() - entry.checked_at < self.ttl and entry.covers(columns):
+                self._entries.move_to_end(cache_key)
+                return entry
+        return None
+
+    def get(self, s3_client, bucket, key, parse=read_csv_response, append_schema=None, columns=None):
+        """
+        Return the parsed object at bucket/key, downloading it only when it changed.
+
+        parse(response, columns=None) reads a response, `columns`
+        (a frozenset) limits what has to be parsed. With an append_schema the
+        object is an append-only CSV: once cached, a change is read as the new
+        bytes at its end (see _read_appended).
+        """
+        cache_key = (bucket, key)
+        entry = self._fresh(cache_key, columns)
+        if entry is None:
+            # One loader per key: concurrent sessions wait for it instead of racing to S3
+            with self._key_lock(cache_key):
+                entry = self._fresh(cache_key, columns) or self._revalidate(s3_client, cache_key, parse, append_schema, columns)
+        # Pages add and replace columns on what they get back, never on the shared frame
+        return entry.frame.copy(deep=False)
+
+    def refresh(self, s3_client, bucket, key, parse=read_csv_response, append_schema=None):
+        """
+        Revalidate the entry of bucket/key now, whatever its age; None when
+        nothing is cached for it (never requested, or evicted).
+
+        Sessions reading a fresh entry do not wait on the key lock, so they keep
+        getting the previous frame until the new one is parsed and stored. The
+        entry keeps the columns it has.
+        """
+        cache_key = (bucket, key)
+        with self._key_lock(cache_key):
+            with self._lock:
+                entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            entry = self._revalidate(s3_client, cache_key, parse, append_schema, entry.columns)
+        return entry.frame.copy(deep=False)
+
+    def _revalidate(self, s3_client, cache_key, parse, append_schema=None, columns=None):
+        bucket, key = cache_key
+        with self._lock:
+            entry = self._entries.get(cache_key)
+
+        if entry is not None and not entry.covers(columns):
+            # Widen: parse what is cached plus what is asked for, from a full GET
+            columns = None if columns is None else entry.columns | columns
+            entry = None
+        elif entry is not None:
+            columns = entry.columns
+
+        if (entry is not None and entry.tail_crc is not None and append_schema is not None
+                and time.monotonic() - entry.loaded_at < APPEND_FULL_RELOAD_SECONDS):
+            appended = self._read_appended(s3_client, cache_key, entry, append_schema)
+            if appended is not None:
+                return appended
+        if entry is not None:
+            try:
+                response = s3_client.get_object(Bucket=bucket, Key=key, IfNoneMatch=entry.etag)
+            except ClientError as error:
+                if error.response.get('Error', {}).get('Code') not in ('304', 'NotModified'):
+                    raise
+                entry.checked_at = time.monotonic()
+                return entry
+        else:
+            response = s3_client.get_object(Bucket=bucket, Key=key)
+
+        if append_schema is not None:
+            response = dict(response, Body=BodyEdges(response['Body']))
+        frame = parse(response, columns=columns)
+        # Tags the frame so derived structures can be cached per dataset version
+        frame.attrs["version"] = f"{bucket}/{key}@{response.get('ETag')}"
+        entry = CacheEntry(frame, response.get('ETag'))
+        entry.columns = columns
+        if append_schema is not None:
+            body = response['Body']
+            entry.remember_end(body.header, body.length, body.tail)
+        self._store(cache_key, entry)
+        return entry
+
+    def _read_appended(self, s3_client, cache_key, entry, schema):
+        """
+        Bring an append-only CSV up to date by downloading only its new bytes.
+
+        The ranged GET starts a few KB before the old end of the object; when
+        those bytes still match the stored checksum, the rest is an append that
+        is parsed on its own and added to the cached frame. Returns None when the
+        object was rewritten or the new rows do not fit, for a full reload.
+
+        Only the tail is compared, so an edit to an earlier row goes unseen until
+        the next full parse, at most APPEND_FULL_RELOAD_SECONDS later; datasets
+        whose rows change must not be declared append_only.
+        """
+        bucket, key = cache_key
+        head = s3_client.head_object(Bucket=bucket, Key=key)
+        if head['ETag'] == entry.etag:
+            entry.checked_at = time.monotonic()
+            return entry
+        if head['ContentLength'] <= entry.length:
+            return None
+        start = entry.length - entry.tail_size
+        try:
+            response = s3_client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-", IfMatch=head['ETag'])
+        except ClientError as error:
+            if error.response.get('Error', {}).get('Code') not in ('412', 'PreconditionFailed'):
+                raise
+            return None
+        body = response['Body'].read()
+        if zlib.crc32(body[:entry.tail_size]) != entry.tail_crc:
+            return None
+        try:
+            tail = BytesIO(entry.header + body[entry.tail_size:])
+            rows = apply_schema(pd.read_csv(tail, usecols=projection(entry.columns)), schema)
+        except ValueError:
+            return None
+        appended = append_rows(entry.frame, rows, schema)
+        if appended is None:
+            return None
+        frame, rows = appended
+
+        etag = head['ETag']
+        frame.attrs["version"] = f"{bucket}/{key}@{etag}"
+        updated = CacheEntry(frame, etag)
+        updated.columns = entry.columns
+        updated.loaded_at = entry.loaded_at
+        updated.remember_end(entry.header, start + len(body), body[-APPEND_CHECK_BYTES:])
+        self._record_append(cache_key, entry.frame, frame, rows)
+        self._store(cache_key, updated)
+        return updated
+
+    def get_partitions(self, s3_client, bucket, prefix, schema=None, refresh=False, columns=None):
+        """
+        Return the CSV objects under a partitioned prefix (e.g.
+        charges/date=2024-07-27/part-0.csv) as one typed frame.
+
+        Once cached, a re-listing downloads only the objects not seen before and
+        appends their rows; a changed or deleted object reloads the whole prefix.
+        refresh=True re-lists a cached prefix now and returns None when the
+        prefix is not cached.
+        """
+        cache_key = (bucket, prefix)
+        if refresh:
+            # Like refresh(): only a cached prefix, re-listed with the columns it has
+            with self._lock:
+                entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            columns = entry.columns
+        entry = None if refresh else self._fresh(cache_key, columns)
+        if entry is None:
+            with self._key_lock(cache_key):
+                entry = (None if refresh else self._fresh(cache_key, columns)) or self._list_partitions(s3_client, cache_key, schema, columns)
+        return entry.frame.copy(deep=False)
+
+    def _list_partitions(self, s3_client, cache_key, schema, columns=None):
+        bucket, prefix = cache_key
+        with self._lock:
+            entry = self._entries.get(cache_key)
+        if entry is not None and not entry.covers(columns):
+            columns = None if columns is None else entry.columns | columns
+            entry = None
+        elif entry is not None:
+            columns = entry.columns
+        parts = list_csv_objects(s3_client, bucket, prefix)
+        if entry is not None and entry.parts == parts:
+            entry.checked_at = time.monotonic()
+            return entry
+
+        def fetch(keys):
+            read = lambda key: read_csv_response(s3_client.get_object(Bucket=bucket, Key=key), schema, columns)
+            with ThreadPoolExecutor(max_workers=S3_MAX_CONNECTIONS) as pool:
+                frames = list(pool.map(read, keys))
+            return concat_chunks(frames)
+
+        known = entry.parts if entry is not None else {}
+        appended = None
+        if known and all(parts.get(key) == etag for key, etag in known.items()):
+            rows = apply_schema(fetch([key for key in parts if key not in known]), schema)
+            appended = append_rows(entry.frame, rows, schema)
+        if appended is not None:
+            frame, rows = appended
+        else:
+            frame = apply_schema(fetch(list(parts)), schema)
+
+        etag = hashlib.md5("".join(f"{key}{etag}" for key, etag in sorted(parts.items())).encode()).hexdigest()
+        frame.attrs["version"] = f"{bucket}/{prefix}@{etag}"
+        updated = CacheEntry(frame, etag)
+        updated.parts = parts
+        updated.columns = columns
+        if appended is not None:
+            self._record_append(cache_key, entry.frame, frame, rows)
+        self._store(cache_key, updated)
+        return updated
+
+    def _record_append(self, cache_key, previous, frame, rows):
+        with self._lock:
+            self._appends[cache_key] = (dataset_version(previous), dataset_version(frame), rows)
+
+    def appended(self, version):
+        """(previous version, new rows) when `version` came from an incremental load, else None."""
+        with self._lock:
+            for previous, current, rows in self._appends.values():
+                if current == version:
+                    return previous, rows
+        return None
+
+    def holds(self, bucket, *keys):
+        """Whether an entry is cached for any of keys."""
+        with self._lock:
+            return any((bucket, key) in self._entries for key in keys)
+
+    def _store(self, cache_key, entry):
+        with self._lock:
+            previous = self._entries.pop(cache_key, None)
+            if previous is not None:
+                self.total_bytes -= previous.nbytes
+            # A frame over the whole budget is served uncached, without flushing the others
+            if entry.nbytes > self.max_bytes:
+                return
+            # Evict least recently used entries until the new frame fits the budget
+            while self._entries and self.total_bytes + entry.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.nbytes
+            self._entries[cache_key] = entry
+            self.total_bytes += entry.nbytes
+
+    def resolve(self, s3_client, bucket, key):
+        """
+        Pick the object to read for a CSV key: its newest columnar snapshot, or the CSV.
+
+        A snapshot is only used while its recorded source ETag matches the CSV, so a
+        CSV rewritten after the last conversion is never shadowed by stale data. The
+        choice is remembered for the TTL, like the frames themselves.
+        """
+        with self._lock:
+            source = self._sources.get((bucket, key))
+            if source is not None and time.monotonic() - source[2] < self.ttl:
+                return source[0], source[1]
+
+        resolved = (key, read_csv_response)
+        try:
+            csv_etag = s3_client.head_object(Bucket=bucket, Key=key)['ETag']
+        except ClientError as error:
+            if not is_missing(error):
+                raise
+            csv_etag = None
+        for suffix, parse in SNAPSHOT_FORMATS.items():
+            try:
+                head = s3_client.head_object(Bucket=bucket, Key=f"{key}.{suffix}")
+            except ClientError as error:
+                if not is_missing(error):
+                    raise
+                continue
+            if csv_etag is None or head.get('Metadata', {}).get(SNAPSHOT_SOURCE_META) == csv_etag:
+                resolved = (f"{key}.{suffix}", parse)
+                break
+
+        with self._lock:
+            self._sources[(bucket, key)] = (resolved[0], resolved[1], time.monotonic())
+        return resolved
+
+    def invalidate(self, bucket=None, key=None):
+        """Drop one entry, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._sources.clear()
+                self._appends.clear()
+                self.total_bytes = 0
+            else:
+                self._sources.pop((bucket, key), None)
+                self._appends.pop((bucket, key), None)
+                entry = self._entries.pop((bucket, key), None)
+                if entry is not None:
+                    self.total_bytes -= entry.nbytes
+
+
+# Module level, so it lives as long as the server process and not a single script run
+dataset_cache = DatasetCache()
+
+
+def estimate_nbytes(value, seen=None):
+    """
+    Approximate memory held by a derived value: the frames and arrays in it,
+    plus the containers and plain objects (indexes, rollups, figures) around them.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_nbytes(key, seen) + estimate_nbytes(item, seen) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item, seen) for item in value)
+    if isinstance(getattr(value, "nbytes", None), int):
+        # Arrow tables and other buffers that know their own size
+        return value.nbytes
+    if hasattr(value, "to_plotly_json"):
+        # Plotly figures: their data and layout, not the validators behind them
+        return sys.getsizeof(value) + estimate_nbytes(value.to_plotly_json(), seen)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + estimate_nbytes(vars(value), seen)
+    return sys.getsizeof(value)
+
+
+class DerivedCache:
+    """
+    Process-wide LRU of values derived from dataset versions: indexes, rollups,
+    computed metrics. Keys must include the versions of the datasets involved,
+    so a reloaded dataset never serves a stale derived value.
+
+    Like DatasetCache, the LRU is bounded by an estimate of the bytes held
+    (estimate_nbytes) rather than by a number of entries, so many small figures
+    and leaderboards cannot push out a few large indexes and rollups that each
+    cost a pass over a whole dataset to rebuild.
+    """
+
+    def __init__(self, max_bytes=DERIVED_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # key -> (value, estimated bytes)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the value cached under key, building it on the first request."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+        value = build()
+        self._store(key, value)
+        return value
+
+    def _store(self, key, value):
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            if nbytes > self.max_bytes:
+                return
+            while self._entries and self.total_bytes + nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted
+            self._entries[key] = (value, nbytes)
+            self.total_bytes += nbytes
+
+    def peek(self, key):
+        """The value cached under key, or None, without building it."""
+        with self._lock:
+            cached = self._entries.get(key)
+            return None if cached is None else cached[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+derived_cache = DerivedCache()
+
+
+def dataset_version(frame):
+    """Identifier of the S3 object version a cached frame was loaded from, or None."""
+    return frame.attrs.get("version")
+
+
+def memoize(key, frames, build):
+    """Cache build() under key and the versions of frames; frames not from the loader are never cached."""
+    versions = tuple(dataset_version(frame) for frame in frames)
+    if None in versions:
+        return build()
+    return derived_cache.get((key, versions), build)
+
+
+def memoize_incremental(key, frame, build, extend):
+    """
+    memoize() for a value derived from one dataset that can absorb new rows.
+
+    When the frame's version came from an incremental load and the value for the
+    version before it is still cached, extend(previous_value, new_rows) stands
+    in for a full build().
+    """
+    def build_or_extend():
+        appended = dataset_cache.appended(dataset_version(frame))
+        if appended is not None:
+            previous = derived_cache.peek((key, (appended[0],)))
+            if previous is not None:
+                return extend(previous, appended[1])
+        return build()
+    return memoize(key, [frame], build_or_extend)
+
+
+def load_csv_from_s3(s3_client, bucket, key, schema=None, refresh=False, columns=None):
+    """
+    Load a CSV dataset from S3 through the shared cache, preferring a columnar snapshot.
+
+    A key ending in "/" is a prefix of partitioned CSV objects, loaded with
+    DatasetCache.get_partitions. refresh=True checks S3 for a newer object now
+    instead of trusting a cached entry younger than the TTL, keeping the columns
+    the entry has, and returns None for a dataset that is not cached. `columns` are the
+    source columns the caller reads (all when None); the frame returned may
+    hold more of them.
+    """
+    if columns is not None:
+        schema = schema or {}
+        # The sort column is always kept, date filters binary search it; snapshots
+        # hold the columns classified from a kept column as well
+        columns = set(columns) | {schema.get("sort_by")} - {None}
+        for column in set(schema.get("classify", [])) & columns:
+            columns |= {f"{column}_{name}" for name in PLAN_CLASSIFIERS}
+        columns = frozenset(columns)
+    if key.endswith("/"):
+        return dataset_cache.get_partitions(s3_client, bucket, key, schema, refresh, columns)
+    if refresh and not dataset_cache.holds(bucket, key, *(f"{key}.{suffix}" for suffix in SNAPSHOT_FORMATS)):
+        return None
+    source_key, read = dataset_cache.resolve(s3_client, bucket, key)
+    # The schema is applied before caching, so every session gets typed frames for free
+    parse = lambda response, columns=None: apply_schema(read(response, schema, columns), schema)
+    # Append-only CSVs are revalidated by reading their new bytes, snapshots never are
+    append_schema = schema if source_key == key and (schema or {}).get("append_only") else None
+    if refresh:
+        return dataset_cache.refresh(s3_client, bucket, source_key, parse, append_schema)
+    return dataset_cache.get(s3_client, bucket, source_key, parse, append_schema, columns)
+
+
+def load_many_from_s3(s3_client, bucket, keys, schemas=None, columns=None):
+    """
+    Load several datasets concurrently and return them by name.
+
+    `keys` maps dataset names to object keys, `schemas` dataset names to their
+    schema and `columns` dataset names to the columns read from them (datasets
+    not listed are loaded whole). Page latency is bounded by the slowest object
+    instead of the sum of all of them.
+    """
+    schemas = schemas or {}
+    columns = columns or {}
+    futures = {
+        name: _prefetch_pool.submit(load_csv_from_s3, s3_client, bucket, key, schemas.get(name), False, columns.get(name))
+        for name, key in keys.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
+class RefreshWorker:
+    """
+    Daemon thread keeping the files of some dashboards that dataset_cache holds warm.
+
+    Each pass revalidates the cached objects concurrently with a conditional GET
+    on their ETag, which is a 304 when nothing changed. Files that were never
+    requested or were evicted by the byte budget are left to the next page
+    that reads them, so the worker never works against the LRU. A changed object is downloaded and
+    parsed on the worker and swapped into the cache in one step, so the first
+    session after an upload neither pays for the load nor sees a partial dataset.
+    A failed pass leaves the cached versions in place until the next one. The
+    dashboards' s3_stats records are computed on the worker for every version.
+
+    `dashboards` may also be a function returning them, called by the first
+    pass, so importing the dashboard modules happens on the worker.
+    """
+
+    def __init__(self, s3_client, dashboards, interval=REFRESH_INTERVAL_SECONDS):
+        self.s3_client = s3_client
+        self.interval = interval
+        self._dashboards = dashboards
+        self._datasets = None
+        self.passes = 0
+        # Its own pool, so page loads never queue behind a refresh download
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="s3-refresh")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="s3-refresh", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._pool.shutdown()
+
+    @property
+    def datasets(self):
+        """(bucket, key, schema, stats) of every file of the dashboards."""
+        if self._datasets is None:
+            dashboards = self._dashboards() if callable(self._dashboards) else self._dashboards
+            self._datasets = [
+                (dashboard.s3_config["bucket_name"], key, dashboard.s3_schemas.get(name),
+                 getattr(dashboard, "s3_stats", {}).get(name, ()))
+                for dashboard in dashboards
+                for name, key in dashboard.s3_config["files"].items()
+            ]
+        return self._datasets
+
+    def refresh_all(self):
+        """Run one refresh pass over the cached datasets."""
+        # Imported here, aws_kpis builds on this module
+        from aws_kpis import dataset_stats
+
+        futures = {
+            key: (self._pool.submit(load_csv_from_s3, self.s3_client, bucket, key, schema, True), stats)
+            for bucket, key, schema, stats in self.datasets
+        }
+        for key, (future, stats) in futures.items():
+            try:
+                frame = future.result()
+                if frame is None:
+                    continue
+                for stat in stats:
+                    dataset_stats(stat, frame)
+            except Exception:
+                log.exception("Background refresh of %s failed", key)
+        self.passes += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_all()
+            self._stop.wait(self.interval)
+
+
+_refresh_worker = None
+_refresh_worker_lock = threading.Lock()
+
+
+def start_refresh_worker(s3_client, dashboards, interval=REFRESH_INTERVAL_SECONDS):
+    """Start the process-wide RefreshWorker on the first call; None when the interval is 0."""
+    global _refresh_worker
+    with _refresh_worker_lock:
+        if _refresh_worker is None and interval > 0:
+            _refresh_worker = RefreshWorker(s3_client, dashboards, interval).start()
+        return _refresh_worker
+
+
+def write_snapshot(s3_client, bucket, key, fmt="parquet", schema=None):
+    """Convert one CSV object into a typed columnar sibling next to it."""
+    response = s3_client.get_object(Bucket=bucket, Key=key)
+    frame = apply_schema(read_csv_response(response, schema), schema)
+
+    buffer = BytesIO()
+    if fmt == "parquet":
+        frame.to_parquet(buffer, index=False)
+    else:
+        frame.reset_index(drop=True).to_feather(buffer)
+    snapshot_key = f"{key}.{fmt}"
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=snapshot_key,
+        Body=buffer.getvalue(),
+        Metadata={SNAPSHOT_SOURCE_META: response['ETag']},
+    )
+    return snapshot_key
+
+
+def convert_all(s3_client, dashboards, fmt="parquet"):
+    """Write typed snapshots for every file of every dashboard's s3_config."""
+    for dashboard in dashboards:
+        bucket_name = dashboard.s3_config["bucket_name"]
+        for name, key in dashboard.s3_config["files"].items():
+            if key.endswith("/"):
+                continue  # partitioned prefixes are read object by object
+            schema = dashboard.s3_schemas.get(name)
+            snapshot_key = write_snapshot(s3_client, bucket_name, key, fmt, schema)
+            print(f"s3://{bucket_name}/{key} -> {snapshot_key}")
+
+
+if __name__ == "__main__":
+    # python aws_data.py convert [--format feather]
+    from aws_braintap import BraninTapApp
+    from aws_stripe import Dashboard
+
+    parser = argparse.ArgumentParser(description="Dashboard dataset tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="Write Parquet/Feather snapshots of every dataset CSV")
+    convert.add_argument("--format", choices=sorted(SNAPSHOT_FORMATS), default="parquet")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        convert_all(get_s3_client(), [Dashboard(), BraninTapApp()], args.format)
@@ -0,0 +1,103 @@
+import logging
+import os
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Engine for grouped aggregates: "duckdb" or "polars" (optional installs) run
+# multi-threaded over Arrow data, "pandas" in-process; "auto" takes the first one
+# installed, or pandas on a single core where threads cannot pay for the conversion
+QUERY_ENGINE = os.environ.get("DASHBOARD_ENGINE", "auto")
+# Below this many rows converting to Arrow costs more than the engine saves
+ENGINE_MIN_ROWS = int(os.environ.get("DASHBOARD_ENGINE_MIN_ROWS", 200_000))
+
+log = logging.getLogger(__name__)
+
+SQL_AGGREGATES = {
+    "sum": "COALESCE(SUM({0}), 0)",
+    "count": "COUNT({0})",
+    "nunique": "COUNT(DISTINCT {0})",
+    "mean": "AVG({0})",
+    "min": "MIN({0})",
+    "max": "MAX({0})",
+    "size": "COUNT(*)",
+}
+
+POLARS_AGGREGATES = {
+    "sum": lambda column: pl.col(column).sum(),
+    "count": lambda column: pl.col(column).count(),
+    "nunique": lambda column: pl.col(column).drop_nulls().n_unique(),
+    "mean": lambda column: pl.col(column).mean(),
+    "min": lambda column: pl.col(column).min(),
+    "max": lambda column: pl.col(column).max(),
+    "size": lambda column: pl.len(),
+}
+
+
+def engine_name():
+    """The engine group_aggregate runs on: QUERY_ENGINE, or the best one installed for "auto"."""
+    installed = {"duckdb": duckdb is not None, "polars": pl is not None, "pandas": True}
+    if QUERY_ENGINE == "auto":
+        if (os.cpu_count() or 1) < 2:
+            return "pandas"
+        return next(name for name, available in installed.items() if available)
+    if not installed.get(QUERY_ENGINE):
+        log.warning("Query engine %s is not installed, using pandas", QUERY_ENGINE)
+        return "pandas"
+    return QUERY_ENGINE
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _duckdb_aggregate(frame, keys, column, agg):
+    keys_sql = ", ".join(map(_quote, keys))
+    sql = (f"SELECT {keys_sql}, {SQL_AGGREGATES[agg].format(_quote(column))} AS {_quote(column)} FROM frame "
+           f"WHERE {' AND '.join(f'{_quote(key)} IS NOT NULL' for key in keys)} GROUP BY {keys_sql}")
+    connection = duckdb.connect()
+    try:
+        connection.register("frame", frame[keys + [column]])
+        return connection.execute(sql).df()
+    finally:
+        connection.close()
+
+
+def _polars_aggregate(frame, keys, column, agg):
+    table = pl.from_pandas(frame[keys + [column]]).drop_nulls(keys)
+    return table.group_by(keys).agg(POLARS_AGGREGATES[agg](column).alias(column)).to_pandas()
+
+
+ENGINES = {"duckdb": _duckdb_aggregate, "polars": _polars_aggregate}
+
+
+def group_aggregate(frame, by, column, agg="sum"):
+    """
+    frame.groupby(by, observed=True)[column].agg(agg), on the query engine.
+
+    Large frames are aggregated by DuckDB or Polars when installed, using every
+    core; the result is the Series pandas would return (groups in key order,
+    missing keys dropped). Small frames, other aggregations and hosts without
+    either engine use pandas.
+    """
+    engine = ENGINES.get(engine_name())
+    if engine is None or agg not in SQL_AGGREGATES or len(frame) < ENGINE_MIN_ROWS:
+        return frame.groupby(by, observed=True)[column].agg(agg)
+    keys = [by] if isinstance(by, str) else list(by)
+    result = engine(frame, keys, column, agg)
+    for key in keys:
+        # Unordered categoricals compare equal whatever their category order, so
+        # go through object values to get the frame's order back
+        result[key] = result[key].astype(object).astype(frame[key].dtype)
+    if agg in ("count", "nunique", "size") or (agg != "mean" and frame[column].dtype.kind in "iu"):
+        result[column] = result[column].astype("int64")
+    result = result.sort_values(keys, kind="stable").set_index(by if isinstance(by, str) else keys)
+    return result[column]
@@ -0,0 +1,489 @@
+import os
+from collections import namedtuple
+
+import pandas as pd
+
+from aws_data import memoize, memoize_incremental
+from aws_metrics import DailyRollup, KeyIndex, Leaderboard, WindowCounter, date_slice, trailing_window
+
+# Distinct-count tiles are exact unless DASHBOARD_DISTINCT=approximate, which
+# answers them from the HyperLogLog sketches of the daily rollups instead; the
+# KPI functions also take exact= to reconcile one mode against the other
+EXACT_DISTINCT = os.environ.get("DASHBOARD_DISTINCT", "exact") != "approximate"
+
+# Trailing windows of the "new users / subscriptions" tiles, in days (0 is the anchor day)
+WINDOW_DAYS = (0, 7, 15, 30, 365)
+WindowCounts = namedtuple("WindowCounts", ["today", "last_7_days", "last_15_days", "last_30_days", "last_year"])
+
+# Column holding the customer key in each Stripe table joined on it
+CUSTOMER_KEYS = {
+    "customers": "id",
+    "subscriptions": "customer_id",
+    "revenue": "customer_id",
+    "payment": "customer_id",
+}
+
+# Daily aggregates behind the monthly/daily charts and approximate distinct
+# counts: source dataset, date column and DailyRollup arguments
+ROLLUPS = {
+    "revenue": {
+        "dataset": "revenue", "date": "created",
+        "dimensions": ["currency", "subscription_plan_family"],
+        "sums": ["net_amount", "tax", "fee", "total_invoice_amount"],
+    },
+    "revenue_created": {
+        "dataset": "revenue", "date": "created",
+    },
+    "revenue_customers": {
+        "dataset": "revenue", "date": "created",
+        "distinct": ["customer_id", "subscription"],
+    },
+    "subscriptions_created": {
+        "dataset": "subscriptions", "date": "created",
+        "dimensions": ["status", "description_plan_family"],
+        "counts": ["customer_id"],
+    },
+    "subscriptions_canceled": {
+        "dataset": "subscriptions", "date": "canceled_at",
+        "dimensions": ["status"],
+    },
+    "subscriptions_trial_end": {
+        "dataset": "subscriptions", "date": "trial_end",
+        "dimensions": ["status"], "days": ["created"],
+        "counts": ["customer_id"],
+    },
+    "customers_created": {
+        "dataset": "customers", "date": "created",
+        "dimensions": ["deleted"],
+        "distinct": ["id"],
+    },
+    "payment_created": {
+        "dataset": "payment", "date": "created_date",
+        "dimensions": ["status"],
+        "distinct": ["id"],
+    },
+    "user_sessions": {
+        "dataset": "users", "date": "tap_session_started_at",
+        "dimensions": ["title"],
+        "distinct": ["userid", "tap_session_id"],
+    },
+    "author_sessions": {
+        "dataset": "authors", "date": "tap_session_started_at",
+        "distinct": ["author", "narrator"],
+    },
+}
+
+SummaryKpis = namedtuple("SummaryKpis", [
+    "today", "total_users", "trial_subscriptions", "paid_subscriptions",
+    "subscriptions", "monthly_subscriptions", "yearly_subscriptions", "promo_subscriptions",
+    "legacy_monthly", "legacy_yearly", "partners_monthly", "partners_yearly",
+    "products_sold", "accessories_sold", "payments_failed",
+    "new_users", "new_subscriptions",
+])
+RevenueKpis = namedtuple("RevenueKpis", [
+    "transaction_amount", "subscription_amount", "product_amount", "tax_amount",
+    "total_revenue", "subscription_revenue", "monthly_subscription_revenue", "yearly_subscription_revenue",
+    "legacy_monthly_revenue", "legacy_yearly_revenue", "partners_monthly_revenue", "partners_yearly_revenue",
+    "retail_monthly_revenue", "retail_yearly_revenue", "accessories_revenue", "products_revenue",
+    "new_subscription_revenue", "renewed_subscription_revenue",
+])
+CustomerKpis = namedtuple("CustomerKpis", ["total", "active", "inactive", "trialing", "new_customers"])
+SubscriptionKpis = namedtuple("SubscriptionKpis", [
+    "total_users", "subscriptions", "monthly_subscriptions", "yearly_subscriptions", "promo_subscriptions",
+    "legacy_monthly", "legacy_yearly", "partners_monthly", "partners_yearly",
+    "users_on_trial", "partners_on_trial", "retailers_on_trial", "retail_monthly", "retail_yearly",
+    "active", "inactive", "trialing", "past_due", "paused", "incomplete_expired",
+    "payment_failed", "partners_payment_failed", "retail_payment_failed", "legacy_payment_failed",
+    "growth_rate", "churn_rate", "trial_conversion", "canceled_due_to_failed",
+])
+PaymentKpis = namedtuple("PaymentKpis", ["transactions", "successful", "failed"])
+FinancialKpis = namedtuple("FinancialKpis", ["sales", "refunds", "payouts", "net_profit_loss"])
+
+SessionSummaryKpis = namedtuple("SessionSummaryKpis", [
+    "partners_without_sessions", "users_without_sessions",
+    "most_played_session", "most_played_count", "least_played_session", "least_played_count",
+    "period_session_counts",
+])
+SessionUserKpis = namedtuple("SessionUserKpis", [
+    "active_users", "completed_minutes", "unique_sessions", "sessions_played",
+    "notifications_enabled", "notifications_disabled",
+])
+AuthorKpis = namedtuple("AuthorKpis", ["authors", "narrators"])
+
+# Whole-dataset headline counters, computed once per dataset version
+UserStats = namedtuple("UserStats", ["users", "partners", "paid_users", "awaken_active"])
+GoalStats = namedtuple("GoalStats", ["users_with_goals", "users_without_goals", "goal_users"])
+
+
+def compute(kpis, data, **params):
+    """
+    Result of kpis(data, **params), shared by every session.
+
+    Memoized on the versions of the datasets in `data` plus the parameters, so a
+    second user opening the same page with the same filters reads every tile
+    from memory. Parameters must be hashable.
+    """
+    names = sorted(data)
+    key = (kpis.__name__, tuple(names), tuple(sorted(params.items())))
+    return memoize(key, [data[name] for name in names], lambda: kpis(data, **params))
+
+
+def dataset_stats(stats, frame):
+    """
+    Result of stats(frame), kept once per dataset version.
+
+    The refresh worker calls this with the dashboards' s3_stats right after it
+    loads a new version, so pages read the record from memory.
+    """
+    return memoize((stats.__name__,), [frame], lambda: stats(frame))
+
+
+def customer_index(data):
+    """Customer key codes across the Stripe tables in data, built once per dataset version."""
+    names = tuple(name for name in CUSTOMER_KEYS if name in data)
+    build = lambda: KeyIndex({name: data[name][CUSTOMER_KEYS[name]] for name in names})
+    return memoize(("customer_index", names), [data[name] for name in names], build)
+
+
+def rollup(data, name):
+    """
+    Daily rollup declared in ROLLUPS over its dataset in data, built once per
+    dataset version; after an incremental load only the new rows are rolled up.
+    """
+    spec = dict(ROLLUPS[name])
+    frame = data[spec.pop("dataset")]
+    build = lambda: DailyRollup(frame, **spec)
+    extend = lambda previous, rows: previous.extend(DailyRollup(rows, **spec))
+    return memoize_incremental(("rollup", name), frame, build, extend)
+
+
+def leaderboard(frame, by, column, agg="sum", filters=()):
+    """
+    Leaderboard of `column` aggregated per `by` over a page's filtered frame.
+
+    Filtered frames keep the version of the dataset they came from, so the
+    grouped result is shared per dataset version and `filters` (the hashable
+    page filters that produced the frame, e.g. its date range).
+    """
+    key = ("leaderboard", by, column, agg, tuple(filters))
+    return memoize(key, [frame], lambda: Leaderboard(frame, by, column, agg))
+
+
+def window_counts(dates, values, anchor):
+    """Distinct values per trailing window ending at anchor, from one sorted pass over dates."""
+    windows = [trailing_window(anchor, days) for days in WINDOW_DAYS]
+    return WindowCounts(*WindowCounter(dates).nunique(values, windows))
+
+
+def sketch_window_counts(daily, column, anchor, **equals):
+    """Approximate window_counts() merged from the daily sketches of a rollup."""
+    windows = [trailing_window(anchor, days) for days in WINDOW_DAYS]
+    # Windows are whole days, [start, end) maps onto the days start..end - 1
+    return WindowCounts(*(daily.distinct(column, start, end - pd.Timedelta(days=1), **equals) for start, end in windows))
+
+
+def ratio_percent(numerator, denominator):
+    return numerator / denominator * 100 if denominator else 0
+
+
+def summary_kpis(data, exact=EXACT_DISTINCT):
+    """Tiles of the Stripe Summary page: revenue, customers, subscriptions and payment."""
+    revenue_df = data['revenue']
+    subscriptions_df = data['subscriptions']
+    payment_df = data['payment']
+    index = customer_index(data)
+
+    revenue_df = revenue_df[revenue_df['created'].notna()]
+    today = revenue_df['created'].max().date()
+
+    # Distinct revenue customers, and those among them with a trialing / active
+    # subscription, as semi-joins on the customer index instead of a fan-out merge
+    trialing = subscriptions_df[subscriptions_df['status'] == 'trialing']
+    active = subscriptions_df[subscriptions_df['status'] == 'active']
+
+    # Subscriptions of known customers; plan columns are classified at load time
+    merged_df = subscriptions_df[index.semi_join('subscriptions', subscriptions_df, 'customers')]
+    plan_family = merged_df["description_plan_family"]
+    billing_period = merged_df["description_billing_period"]
+    item_kind = merged_df['description_item_kind']
+
+    if exact:
+        total_users = index.distinct('revenue', revenue_df)
+        payments_failed = payment_df.loc[payment_df['status'] == 'failed', 'id'].nunique()
+        new_users = window_counts(revenue_df['created'], revenue_df['customer_id'], today)
+        new_subscriptions = window_counts(revenue_df['created'], revenue_df['subscription'], today)
+    else:
+        revenue_daily = rollup(data, "revenue_customers")
+        total_users = revenue_daily.distinct('customer_id')
+        payments_failed = rollup(data, "payment_created").distinct('id', status='failed')
+        new_users = sketch_window_counts(revenue_daily, 'customer_id', today)
+        new_subscriptions = sketch_window_counts(revenue_daily, 'subscription', today)
+
+    return SummaryKpis(
+        today=today,
+        total_users=total_users,
+        trial_subscriptions=index.distinct('revenue', revenue_df, within='subscriptions', within_rows=trialing),
+        paid_subscriptions=index.distinct('revenue', revenue_df, within='subscriptions', within_rows=active),
+        subscriptions=int(merged_df["description"].notna().sum()),
+        monthly_subscriptions=int((billing_period == 'monthly').sum()),
+        yearly_subscriptions=int((billing_period == 'yearly').sum()),
+        promo_subscriptions=int((plan_family == 'promo').sum()),
+        legacy_monthly=int(((plan_family == 'legacy') & (billing_period == 'monthly')).sum()),
+        legacy_yearly=int(((plan_family == 'legacy') & (billing_period == 'yearly')).sum()),
+        partners_monthly=int(((plan_family == 'partner') & (billing_period == 'monthly')).sum()),
+        partners_yearly=int(((plan_family == 'partner') & (billing_period == 'yearly')).sum()),
+        products_sold=int((item_kind == 'product').sum()),
+        accessories_sold=int((item_kind == 'accessory').sum()),
+        payments_failed=payments_failed,
+        new_users=new_users,
+        new_subscriptions=new_subscriptions,
+    )
+
+
+def revenue_kpis(data, start_date, end_date):
+    """Tiles of the Revenue page; the first four cover the selected date range."""
+    revenue_df = data['revenue']
+    charges_df = data['charges']
+
+    filtered_df = date_slice(revenue_df, 'created', start_date, end_date)
+    invoice_amount = filtered_df['total_invoice_amount']
+    is_subscription = filtered_df['description_item_kind'] == 'subscription'
+
+    revenue_df = revenue_df[revenue_df['created'].notna()]
+    net_amount = revenue_df["net_amount"]
+    sub_kind = revenue_df["subscription_item_kind"] == 'subscription'
+    sub_family = revenue_df["subscription_plan_family"]
+    sub_monthly = revenue_df["subscription_billing_period"] == 'monthly'
+    sub_yearly = revenue_df["subscription_billing_period"] == 'yearly'
+    retail = revenue_df["description_plan_family"] == 'retail'
+    item_kind = revenue_df['description_item_kind']
+
+    is_update = charges_df['charge_description'].str.contains("Subscription update", na=False, regex=False)
+
+    return RevenueKpis(
+        transaction_amount=invoice_amount.sum(),
+        subscription_amount=invoice_amount[is_subscription].sum(),
+        product_amount=invoice_amount[~is_subscription].sum(),
+        tax_amount=filtered_df['tax'].sum(),
+        total_revenue=net_amount.sum(),
+        subscription_revenue=net_amount[sub_kind].sum(),
+        monthly_subscription_revenue=net_amount[sub_kind & sub_monthly].sum(),
+        yearly_subscription_revenue=net_amount[sub_kind & sub_yearly].sum(),
+        legacy_monthly_revenue=net_amount[(sub_family == 'legacy') & sub_monthly].sum(),
+        legacy_yearly_revenue=net_amount[(sub_family == 'legacy') & sub_yearly].sum(),
+        partners_monthly_revenue=net_amount[(sub_family == 'partner') & sub_monthly].sum(),
+        partners_yearly_revenue=net_amount[(sub_family == 'partner') & sub_yearly].sum(),
+        retail_monthly_revenue=net_amount[retail & (revenue_df["description_billing_period"] == 'monthly')].sum(),
+        retail_yearly_revenue=net_amount[retail & (revenue_df["description_billing_period"] == 'yearly')].sum(),
+        accessories_revenue=net_amount[item_kind == 'accessory'].sum(),
+        products_revenue=net_amount[item_kind == 'product'].sum(),
+        new_subscription_revenue=charges_df.loc[~is_update, 'charge_amount'].sum(),
+        renewed_subscription_revenue=charges_df.loc[is_update, 'charge_amount'].sum(),
+    )
+
+
+def customer_kpis(data, start_date, end_date, exact=EXACT_DISTINCT):
+    """Tiles of the Customers page: statuses of the subscriptions ending in the range, and sign-ups."""
+    customers_df = data['customers']
+    subscriptions_df = data['subscriptions']
+    index = customer_index(data)
+
+    customers_df = customers_df[customers_df["deleted"] == False]
+    filtered_sub_df = date_slice(subscriptions_df, "trial_end", start_date, end_date)
+    status = filtered_sub_df.loc[index.semi_join('subscriptions', filtered_sub_df, 'customers', customers_df), "status"]
+
+    active = int((status == "active").sum())
+    inactive = int((status != "active").sum())
+    trialing = int((status == "trialing").sum())
+    today = customers_df['created'].max().date()
+    if exact:
+        new_customers = window_counts(customers_df['created'], customers_df['id'], today)
+    else:
+        new_customers = sketch_window_counts(rollup(data, "customers_created"), 'id', today, deleted=False)
+    return CustomerKpis(
+        total=active + inactive + trialing,
+        active=active,
+        inactive=inactive,
+        trialing=trialing,
+        new_customers=new_customers,
+    )
+
+
+def subscription_kpis(data, start_date, end_date):
+    """Tiles of the Subscriptions page: plan mix, statuses in the range, failures and rates."""
+    subscriptions_df = data['subscriptions']
+    index = customer_index(data)
+
+    # Subscriptions of known customers; plan columns are classified at load time
+    merged_df = subscriptions_df[index.semi_join('subscriptions', subscriptions_df, 'customers')]
+    plan_family = merged_df["description_plan_family"]
+    billing_period = merged_df["description_billing_period"]
+    is_legacy = plan_family == 'legacy'
+    is_partner = plan_family == 'partner'
+    is_retail = (plan_family == 'retail') & (merged_df["description_item_kind"] == 'subscription')
+    is_monthly = billing_period == 'monthly'
+    is_yearly = billing_period == 'yearly'
+    is_trialing = merged_df["status"] == "trialing"
+    is_canceled = merged_df["status"] == "canceled"
+
+    status = date_slice(subscriptions_df, "trial_end", start_date, end_date)["status"]
+    active = int((status == "active").sum())
+    inactive = int((status != "active").sum())
+    trialing = int((status == "trialing").sum())
+
+    payment_failed = int((subscriptions_df["status"] == "canceled").sum())
+    partners_payment_failed = int((is_partner & is_canceled).sum())
+    retail_payment_failed = int((is_retail & is_canceled).sum())
+    legacy_payment_failed = int((is_legacy & is_canceled).sum())
+    unplanned_failed = payment_failed - partners_payment_failed - retail_payment_failed - legacy_payment_failed
+
+    return SubscriptionKpis(
+        total_users=len(merged_df),
+        subscriptions=int(merged_df["description"].notna().sum()),
+        monthly_subscriptions=int(is_monthly.sum()),
+        yearly_subscriptions=int(is_yearly.sum()),
+        promo_subscriptions=int((plan_family == 'promo').sum()),
+        legacy_monthly=int((is_legacy & is_monthly).sum()),
+        legacy_yearly=int((is_legacy & is_yearly).sum()),
+        partners_monthly=int((is_partner & is_monthly).sum()),
+        partners_yearly=int((is_partner & is_yearly).sum()),
+        users_on_trial=int(is_trialing.sum()),
+        partners_on_trial=int((is_partner & is_trialing).sum()),
+        retailers_on_trial=int((is_retail & is_trialing).sum()),
+        retail_monthly=int((is_retail & is_monthly).sum()),
+        retail_yearly=int((is_retail & is_yearly).sum()),
+        active=active,
+        inactive=inactive,
+        trialing=trialing,
+        past_due=int((status == "past_due").sum()),
+        paused=int((status == "paused").sum()),
+        incomplete_expired=int((subscriptions_df["status"] == "incomplete_expired").sum()),
+        payment_failed=payment_failed,
+        partners_payment_failed=partners_payment_failed,
+        retail_payment_failed=retail_payment_failed,
+        legacy_payment_failed=legacy_payment_failed,
+        growth_rate=ratio_percent(active - inactive, inactive),
+        churn_rate=ratio_percent(inactive - active, active),
+        trial_conversion=ratio_percent(active - trialing, trialing),
+        canceled_due_to_failed=ratio_percent(unplanned_failed, payment_failed),
+    )
+
+
+def payment_kpis(data, start_date, end_date):
+    """Transaction counts of the Payment page over the selected range."""
+    status = date_slice(data['payment'], 'created_date', start_date, end_date)["status"]
+    return PaymentKpis(
+        transactions=len(status),
+        successful=int((status == "succeeded").sum()),
+        failed=int((status == "failed").sum()),
+    )
+
+
+def financial_kpis(data, start_date, end_date):
+    """Totals of the Financial page over the selected months."""
+    filtered_df = date_slice(data['financial'], 'month', start_date, end_date)
+    return FinancialKpis(
+        sales=filtered_df['total_sales'].sum(),
+        refunds=filtered_df['total_refunds'].sum(),
+        payouts=filtered_df['total_payouts'].sum(),
+        net_profit_loss=filtered_df['net_profit_loss'].sum(),
+    )
+
+
+def session_summary_kpis(data, now, periods):
+    """
+    Tiles of the BrainTap Summary page.
+
+    `periods` maps tile names to trailing days before `now`; a period without any
+    session started in it is reported as None.
+    """
+    summary = data['summary']
+    no_minutes = summary['completed_minutes'].isna()
+    partners = summary.loc[(summary['title'] == 'Paid Partner (Unlimited)') & no_minutes, 'userid']
+    users = summary.loc[(summary['title'] == 'BT Paid Customer (Limited)') & no_minutes, 'userid']
+    session_counts = summary['tap_session_id'].value_counts()
+
+    # Sessions started in each trailing period, from one sorted pass over the start times
+    windows = [(now - pd.Timedelta(days=days), None) for _, days in periods]
+    started = WindowCounter(summary['tap_session_started_at'])
+    rows = started.count(windows)
+    sessions = started.count(windows, summary['tap_session_id'])
+
+    return SessionSummaryKpis(
+        partners_without_sessions=partners.nunique(),
+        users_without_sessions=users.nunique(),
+        most_played_session=session_counts.idxmax(),
+        most_played_count=session_counts.max(),
+        least_played_session=session_counts.idxmin(),
+        least_played_count=session_counts.min(),
+        period_session_counts=tuple(
+            (period, session_count if row_count else None)
+            for (period, _), row_count, session_count in zip(periods, rows, sessions)
+        ),
+    )
+
+
+def session_user_kpis(data, start_date, end_date, title, exact=EXACT_DISTINCT):
+    """
+    Tiles of the BrainTap Users page for the selected range and user group ('All' for every group).
+
+    Approximate distinct counts cover whole days, the end date included.
+    """
+    filtered_df = date_slice(data['users'], 'tap_session_started_at', start_date, end_date)
+    if title != 'All':
+        filtered_df = filtered_df[filtered_df['title'] == title]
+    notifications = filtered_df.loc[filtered_df['userid'].notna(), 'user_notifications_enabled']
+    if exact:
+        active_users = filtered_df['userid'].nunique()
+        unique_sessions = filtered_df['tap_session_id'].nunique()
+    else:
+        daily = rollup(data, "user_sessions")
+        equals = {} if title == 'All' else {'title': title}
+        active_users = daily.distinct('userid', start_date, end_date, **equals)
+        unique_sessions = daily.distinct('tap_session_id', start_date, end_date, **equals)
+    return SessionUserKpis(
+        active_users=active_users,
+        completed_minutes=filtered_df['completed_minutes'].sum(),
+        unique_sessions=unique_sessions,
+        sessions_played=int(filtered_df['tap_session_id'].count()),
+        notifications_enabled=int((notifications == True).sum()),
+        notifications_disabled=int((notifications == False).sum()),
+    )
+
+
+def author_kpis(data, exact=EXACT_DISTINCT):
+    """Distinct authors and narrators of the BrainTap Authors page."""
+    if not exact:
+        daily = rollup(data, "author_sessions")
+        return AuthorKpis(authors=daily.distinct('author'), narrators=daily.distinct('narrator'))
+    authors = data['authors']
+    return AuthorKpis(authors=authors['author'].nunique(), narrators=authors['narrator'].nunique())
+
+
+def user_stats(frame):
+    """Distinct users of a BrainTap session dataset, overall and in the partner, paid and Awaken groups."""
+    users = frame.groupby('title', observed=True)['userid'].nunique()
+    awaken = [title for title in users.index if 'awaken' in str(title).lower()]
+    return UserStats(
+        users=frame['userid'].nunique(),
+        partners=int(users.get('Paid Partner (Unlimited)', 0)),
+        paid_users=int(users.get('BT Paid Customer (Limited)', 0)),
+        awaken_active=frame.loc[frame['title'].isin(awaken), 'userid'].nunique(),
+    )
+
+
+def goal_stats(frame):
+    """
+    Distinct users of the goals dataset with and without a session goal.
+
+    goal_users pairs each numbered goal with the users who set it.
+    """
+    has_goal = frame['user_session_goals'].notna()
+    users_with_goals = frame.loc[has_goal, 'userid'].nunique()
+    goals = pd.to_numeric(frame['user_session_goals'], errors='coerce')
+    goal_users = frame['userid'].groupby(goals).nunique()
+    return GoalStats(
+        users_with_goals=users_with_goals,
+        users_without_goals=frame['userid'].nunique() - users_with_goals,
+        goal_users=tuple((goal, int(count)) for goal, count in goal_users.items()),
+    )
@@ -0,0 +1,423 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from aws_engine import group_aggregate
+
+# HyperLogLog registers per sketch are 2 ** HLL_PRECISION; the relative standard
+# error of a distinct count is about 1.04 / sqrt(2 ** HLL_PRECISION), 1.6% at 12
+HLL_PRECISION = 12
+
+
+def trailing_window(anchor, days):
+    """
+    Date window used by the "last N days" tiles, as a half-open [start, end) pair.
+
+    days == 0 is the anchor day itself; otherwise the window covers the N days
+    before the anchor, excluding the anchor day.
+    """
+    anchor = pd.Timestamp(anchor).normalize()
+    if days == 0:
+        return anchor, anchor + datetime.timedelta(days=1)
+    return anchor - datetime.timedelta(days=days), anchor
+
+
+def date_slice(frame, column, start, end):
+    """
+    Rows with start <= column <= end.
+
+    Frames loaded with a "sort_by" schema are sorted on that column, so the range
+    resolves to two binary searches and a positional slice, without scanning or
+    copying. Any other frame falls back to a boolean mask.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    if frame.attrs.get("sorted_by") != column:
+        return frame[(frame[column] >= start) & (frame[column] <= end)]
+    values = frame[column].to_numpy()
+    lo = np.searchsorted(values, start.to_datetime64(), 'left')
+    hi = np.searchsorted(values, end.to_datetime64(), 'right')
+    return frame.iloc[lo:max(lo, hi)]
+
+
+class WindowCounter:
+    """
+    Counts and distinct counts over many date windows of the same column.
+
+    The dates are sorted once; each window boundary is then a binary search, and
+    the distinct counts of all windows sharing an end date come out of a single
+    pass over the entity codes instead of one nunique() per window.
+    """
+
+    def __init__(self, dates):
+        values = pd.Series(dates).to_numpy()
+        valid = np.flatnonzero(~pd.isna(values))
+        order = np.argsort(values[valid], kind='stable')
+        # Row positions in the original frame, sorted by date (missing dates dropped)
+        self.positions = valid[order]
+        self.dates = values[self.positions]
+
+    def bounds(self, start=None, end=None):
+        """Sorted positions [lo, hi) of the rows with start <= date < end."""
+        lo = 0 if start is None else np.searchsorted(self.dates, pd.Timestamp(start).to_datetime64(), 'left')
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, pd.Timestamp(end).to_datetime64(), 'left')
+        return lo, max(lo, hi)
+
+    def count(self, windows, values=None):
+        """Rows per (start, end) window, or non-null `values` per window when given."""
+        if values is None:
+            present = np.ones(len(self.dates), dtype=np.int64)
+        else:
+            present = pd.notna(np.asarray(values)[self.positions]).astype(np.int64)
+        prefix = np.concatenate([[0], np.cumsum(present)])
+        counts = []
+        for start, end in windows:
+            lo, hi = self.bounds(start, end)
+            counts.append(int(prefix[hi] - prefix[lo]))
+        return counts
+
+    def nunique(self, values, windows):
+        """Distinct non-null `values` per (start, end) window."""
+        codes, _ = pd.factorize(np.asarray(values)[self.positions])
+        bounds = [self.bounds(start, end) for start, end in windows]
+        counts = [0] * len(windows)
+
+        for hi in set(hi for _, hi in bounds):
+            # Last position of every entity seen before hi: an entity is in [lo, hi)
+            # exactly when that position is >= lo
+            prefix = codes[:hi]
+            seen = prefix >= 0
+            reversed_codes = prefix[seen][::-1]
+            _, first_from_end = np.unique(reversed_codes, return_index=True)
+            last_seen = np.sort(np.flatnonzero(seen)[::-1][first_from_end])
+            for i, (lo, window_hi) in enumerate(bounds):
+                if window_hi == hi:
+                    counts[i] = int(len(last_seen) - np.searchsorted(last_seen, lo, 'left'))
+        return counts
+
+
+def hll_sketches(values, groups=None, group_count=1, precision=HLL_PRECISION):
+    """
+    HyperLogLog registers of the non-null `values`, one row of 2 ** precision
+    uint8 registers per group code in `groups` (all values in group 0 when None).
+
+    Sketches merge by taking the element-wise maximum of their rows, so a
+    distinct count over any set of groups is a max over rows plus hll_count().
+    """
+    values = pd.Series(values).reset_index(drop=True)
+    groups = np.zeros(len(values), dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+    present = values.notna().to_numpy()
+    hashes = pd.util.hash_pandas_object(values[present], index=False).to_numpy()
+    width = 64 - precision
+    register = (hashes >> np.uint64(width)).astype(np.int64)
+    rest = hashes & np.uint64((1 << width) - 1)
+    # Rank is the position of the first set bit of the remaining bits, counted from the top
+    bits = np.zeros(len(rest), dtype=np.int64)
+    nonzero = rest > 0
+    bits[nonzero] = np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64) + 1
+    # The float log2 can round up just below a power of two
+    over = nonzero & (np.left_shift(np.uint64(1), np.maximum(bits - 1, 0).astype(np.uint64)) > rest)
+    bits[over] -= 1
+    rank = (width - bits + 1).astype(np.uint8)
+
+    registers = np.zeros(group_count << precision, dtype=np.uint8)
+    np.maximum.at(registers, (groups[present] << precision) + register, rank)
+    return registers.reshape(group_count, 1 << precision)
+
+
+def hll_count(registers):
+    """Estimated distinct count of one merged sketch (small counts use linear counting)."""
+    registers = np.asarray(registers)
+    m = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+
+class DailyRollup:
+    """
+    Daily aggregates of one dataset, built once per dataset version.
+
+    One row per day of `date` x dimension values, holding the number of rows,
+    the sums of `sums` columns and the non-missing counts of `counts` columns
+    (as `<column>_count`). `days` are other date columns kept at day resolution
+    as extra dimensions, e.g. the creation day of subscriptions rolled up by
+    trial end. Rows without a date are left out. Date-filtered and monthly
+    charts then regroup these few thousand rows instead of the raw frame.
+
+    `distinct` columns get a HyperLogLog sketch per rollup row, so approximate
+    distinct counts over any date range are sketch merges (see HLL_PRECISION
+    for the error bound).
+    """
+
+    def __init__(self, frame, date, dimensions=(), sums=(), counts=(), days=(), distinct=()):
+        frame = frame[frame[date].notna()]
+        self.keys = ["date"] + list(days) + list(dimensions)
+        keys = [frame[date].dt.normalize().rename("date")]
+        keys += [frame[column].dt.normalize() for column in days]
+        keys += [frame[column] for column in dimensions]
+        grouped = frame.groupby(keys, observed=True, dropna=False, sort=True)
+        table = grouped.size().rename("rows").to_frame()
+        for column in sums:
+            table[column] = grouped[column].sum()
+        for column in counts:
+            table[f"{column}_count"] = grouped[column].count()
+        self.table = table.reset_index()
+        self.table.attrs["sorted_by"] = "date"
+        self.sketches = {}
+        if distinct:
+            groups = grouped.ngroup().to_numpy()
+            for column in distinct:
+                self.sketches[column] = hll_sketches(frame[column], groups, len(self.table))
+
+    def extend(self, other):
+        """
+        Rollup of the rows of both rollups, e.g. this one and one built over the
+        rows appended since: matching days and dimensions are added together and
+        their sketches merged.
+        """
+        tables = [self.table, other.table]
+        for column in self.keys:
+            if isinstance(self.table[column].dtype, pd.CategoricalDtype) and isinstance(other.table[column].dtype, pd.CategoricalDtype):
+                ours, theirs = self.table[column].cat.categories, other.table[column].cat.categories
+                # Appended rows carry the categories of the grown frame, normally a superset of ours
+                categories = theirs if ours.isin(theirs).all() else ours.append(theirs.difference(ours))
+                tables = [table.assign(**{column: table[column].cat.set_categories(categories)}) for table in tables]
+        both = pd.concat(tables, ignore_index=True)
+        grouped = both.groupby(self.keys, observed=True, dropna=False, sort=True)
+        measures = [column for column in both.columns if column not in self.keys]
+
+        merged = DailyRollup.__new__(DailyRollup)
+        merged.keys = self.keys
+        merged.table = grouped[measures].sum().reset_index()
+        merged.table.attrs["sorted_by"] = "date"
+        merged.sketches = {}
+        groups = grouped.ngroup().to_numpy()
+        for column, registers in self.sketches.items():
+            combined = np.zeros((len(merged.table), registers.shape[1]), dtype=np.uint8)
+            np.maximum.at(combined, groups, np.concatenate([registers, other.sketches[column]]))
+            merged.sketches[column] = combined
+        return merged
+
+    def select(self, start=None, end=None, **equals):
+        """Rollup rows of the days start..end (both included) whose dimensions equal the given values."""
+        table = self.table
+        if start is not None or end is not None:
+            start = table["date"].min() if start is None else pd.Timestamp(start).normalize()
+            end = table["date"].max() if end is None else pd.Timestamp(end).normalize()
+            table = date_slice(table, "date", start, end)
+        for column, value in equals.items():
+            table = table[table[column] == value]
+        return table
+
+    def by_period(self, measures, freq="M", start=None, end=None, on="date", by=(), **equals):
+        """
+        Measures summed per calendar period of `on` (the rollup day or one of
+        `days`), split by the `by` dimensions, as a frame indexed by period.
+        """
+        table = self.select(start, end, **equals)
+        keys = [table[on].dt.to_period(freq).rename(on)] + [table[column] for column in by]
+        return table.groupby(keys, observed=True, sort=True)[list(measures)].sum()
+
+    def distinct(self, column, start=None, end=None, **equals):
+        """Approximate distinct non-null `column` values over the rows select() returns."""
+        rows = self.select(start, end, **equals).index.to_numpy()
+        if not len(rows):
+            return 0
+        return hll_count(self.sketches[column][rows].max(axis=0))
+
+
+def weighted_value_counts(values, weights):
+    """value_counts() of `values` where each row counts `weights` times (zero-weight rows drop out)."""
+    rows = pd.DataFrame({"value": np.asarray(values, dtype=object), "weight": np.asarray(weights)})
+    counts = group_aggregate(rows, "value", "weight").rename_axis(None).rename(None)
+    return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+
+class KeyIndex:
+    """
+    Integer codes for one join key (e.g. customer_id) shared by several tables.
+
+    Built once per dataset version. Joins are answered as semi-joins, code
+    lookups and per-key multiplicities, so time and memory scale with the size of
+    the tables rather than with the size of a materialized many-to-many merge.
+    Row subsets of the indexed tables (date slices, filters) are accepted
+    anywhere a table's rows are expected.
+    """
+
+    def __init__(self, keys):
+        # keys: table name -> Series of key values, indexed like that table's frame
+        names = list(keys)
+        stacked = pd.concat([keys[name].astype(object) for name in names], ignore_index=True)
+        codes, uniques = pd.factorize(stacked)
+        self.size = len(uniques)
+        self._codes = {}
+        offset = 0
+        for name in names:
+            length = len(keys[name])
+            self._codes[name] = pd.Series(codes[offset:offset + length], index=keys[name].index)
+            offset += length
+
+    def codes(self, name, rows=None):
+        """Key code of every row of a table (or of a subset of its rows); -1 for a missing key."""
+        codes = self._codes[name]
+        if rows is not None:
+            codes = codes.reindex(rows.index, fill_value=-1)
+        return codes.to_numpy()
+
+    def key_counts(self, name, rows=None):
+        """Number of rows per key code."""
+        codes = self.codes(name, rows)
+        return np.bincount(codes[codes >= 0], minlength=self.size)
+
+    def distinct(self, name, rows=None, within=None, within_rows=None):
+        """Distinct keys in a table, optionally only those also present in table `within`."""
+        present = self.key_counts(name, rows) > 0
+        if within is not None:
+            present &= self.key_counts(within, within_rows) > 0
+        return int(present.sum())
+
+    def semi_join(self, name, rows, other, other_rows=None):
+        """Boolean mask over `rows` of table `name`: rows whose key appears in table `other`."""
+        codes = self.codes(name, rows)
+        present = self.key_counts(other, other_rows) > 0
+        return (codes >= 0) & present[np.maximum(codes, 0)]
+
+    def fanout(self, name, rows, other, other_rows=None, outer=False):
+        """
+        How many rows each of `rows` becomes when joined to `other`: the weights
+        that turn counts over `rows` into counts over the join. With outer=True,
+        unmatched rows count once, as in a left join.
+        """
+        codes = self.codes(name, rows)
+        matches = np.where(codes >= 0, self.key_counts(other, other_rows)[np.maximum(codes, 0)], 0)
+        return np.maximum(matches, 1) if outer else matches
+
+    def lookup(self, name, rows, other, other_frame, columns):
+        """Columns of the first `other_frame` row sharing each row's key (missing when none)."""
+        other_codes = self.codes(other, other_frame)
+        first = np.full(self.size + 1, -1)
+        positions = np.arange(len(other_codes))
+        keyed = other_codes >= 0
+        # Assign in reverse so the first occurrence of each key wins
+        first[other_codes[keyed][::-1]] = positions[keyed][::-1]
+        codes = self.codes(name, rows)
+        matched = first[np.where(codes >= 0, codes, self.size)]
+        found = matched >= 0
+        looked_up = {}
+        for column in columns:
+            values = other_frame[column].to_numpy()
+            picked = values[np.maximum(matched, 0)] if len(values) else np.full(len(matched), None)
+            looked_up[column] = pd.Series(picked, index=rows.index).where(found)
+        return pd.DataFrame(looked_up, index=rows.index)
+
+
+class TrigramIndex:
+    """
+    Case-insensitive literal substring search over one text column.
+
+    Built once per dataset version: every lower-cased value is split into its
+    3-character substrings, and each trigram maps to the sorted row positions
+    containing it. A query intersects the postings of its trigrams and verifies
+    only the surviving candidates, so a keystroke costs a few array
+    intersections instead of a regex scan of the whole column. Terms shorter
+    than 3 characters have no trigrams and fall back to a literal scan.
+
+    Only the postings are kept, as 32-bit row positions: candidates are verified
+    against the indexed column passed to each query (the cached dataset's own),
+    so an index over millions of values stays well inside the derived cache's
+    byte budget.
+    """
+
+    # Values are encoded in blocks to bound the temporary code point arrays
+    block_rows = 100_000
+
+    def __init__(self, values):
+        self.labels = values.index
+        keys, rows = [np.array([], dtype=np.int64)], [np.array([], dtype=np.uint32)]
+        for start in range(0, len(values), self.block_rows):
+            block = values.iloc[start:start + self.block_rows].astype("string").str.lower()
+            block = block.fillna("").to_numpy(dtype=str)
+            width = block.dtype.itemsize // 4
+            if width < 3:
+                continue
+            # Fixed-width code points, zero-padded past the end of each value
+            points = block.view(np.uint32).reshape(len(block), width).astype(np.int64)
+            block_keys = (points[:, :-2] << 42) | (points[:, 1:-1] << 21) | points[:, 2:]
+            inside = points[:, 2:] != 0
+            keys.append(block_keys[inside])
+            positions = np.arange(start, start + len(block), dtype=np.uint32)
+            rows.append(np.broadcast_to(positions[:, None], inside.shape)[inside])
+        rows = np.concatenate(rows)
+        codes, self._grams = pd.factorize(np.concatenate(keys), sort=True)
+        # Rows are generated in ascending order, so a stable sort keeps every posting
+        # sorted; 16-bit codes (the usual case) sort by radix in linear time
+        narrow = codes.astype(np.uint16) if len(self._grams) <= 1 << 16 else codes
+        order = np.argsort(narrow, kind='stable')
+        codes, rows = codes[order], rows[order]
+        # A trigram repeated within one value is posted once
+        first = np.ones(len(codes), dtype=bool)
+        first[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes, self._rows = codes[first], rows[first]
+        self._bounds = np.r_[0, np.cumsum(np.bincount(codes, minlength=len(self._grams)))]
+
+    def _postings(self, gram):
+        key = (ord(gram[0]) << 42) | (ord(gram[1]) << 21) | ord(gram[2])
+        i = np.searchsorted(self._grams, key)
+        if i == len(self._grams) or self._grams[i] != key:
+            return np.array([], dtype=np.uint32)
+        return self._rows[self._bounds[i]:self._bounds[i + 1]]
+
+    def positions(self, values, term):
+        """Row positions whose value contains term, ignoring case; `values` is the indexed column."""
+        term = term.lower()
+        if len(term) < 3:
+            found = values.astype("string").str.lower().str.contains(term, regex=False, na=False).to_numpy()
+            return np.flatnonzero(found)
+        grams = sorted({term[i:i + 3] for i in range(len(term) - 2)}, key=lambda gram: len(self._postings(gram)))
+        candidates = self._postings(grams[0])
+        for gram in grams[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, self._postings(gram), assume_unique=True)
+        if len(term) == 3 or not len(candidates):
+            return candidates
+        # Trigrams present in any order; confirm the whole term on the candidates only
+        candidate_values = values.iloc[candidates].astype("string").str.lower()
+        found = candidate_values.str.contains(term, regex=False, na=False).to_numpy()
+        return candidates[found]
+
+    def matches(self, values, rows, term):
+        """
+        Boolean mask over `rows` (the indexed frame or a subset of it) whose
+        value contains term; `values` is the indexed column.
+        """
+        return rows.index.isin(self.labels[self.positions(values, term)])
+
+
+class Leaderboard:
+    """
+    One grouped aggregate of a frame, ranked on demand.
+
+    The groupby runs once, on the query engine (see aws_engine); top() and
+    bottom() then pick the k largest/smallest groups with nlargest/nsmallest (a
+    partial selection, ties in group order) instead of sorting every group for
+    each "top 10" chart.
+    """
+
+    def __init__(self, frame, by, column, agg="sum"):
+        self.values = group_aggregate(frame, by, column, agg)
+
+    def top(self, k=10, name=None):
+        """Frame of the k groups with the largest values, largest first."""
+        return self._frame(self.values.nlargest(k), name)
+
+    def bottom(self, k=10, name=None, above=None):
+        """Frame of the k groups with the smallest values (only those > above when given), smallest first."""
+        values = self.values if above is None else self.values[self.values > above]
+        return self._frame(values.nsmallest(k), name)
+
+    def _frame(self, values, name):
+        return values.reset_index(name=name or values.name)
@@ -0,0 +1,65 @@
+import math
+import os
+
+import streamlit as st
+
+# Rows a paged table sends to the browser at a time
+PAGE_ROWS = int(os.environ.get("DASHBOARD_PAGE_ROWS", 100))
+
+
+def lazy_expander(label, key, render, *args, **kwargs):
+    """
+    st.expander whose content, render(*args, **kwargs), only runs while it is open.
+
+    The expander tracks its open state under `key` and reruns the page when the
+    user toggles it, so a collapsed "VIEW DATA" table is neither computed nor
+    sent to the browser. Opened ones stay open across reruns; what they show
+    comes from the memoized per-version results the page already holds.
+    """
+    container = st.expander(label, key=key, on_change="rerun")
+    if container.open:
+        with container:
+            render(*args, **kwargs)
+    return container
+
+
+def page_rows(frame, page, size=PAGE_ROWS, sort_by=None, descending=False):
+    """
+    Positions of the rows on one page of frame, ordered by sort_by (missing
+    values last, ties in frame order).
+
+    Frames already sorted on the column (attrs "sorted_by") are sliced as they
+    are; numeric and date columns take the first pages from a partial
+    selection (nsmallest/nlargest) instead of sorting every row.
+    """
+    start, stop = page * size, (page + 1) * size
+    if sort_by is None or (frame.attrs.get("sorted_by") == sort_by and not descending):
+        return range(start, min(stop, len(frame)))
+    values = frame[sort_by].reset_index(drop=True)
+    if values.dtype.kind in "iufmM" and stop < len(values) // 2:
+        picked = values.nlargest(stop) if descending else values.nsmallest(stop)
+        if len(picked) == stop:
+            return picked.index[start:stop]
+    order = values.sort_values(ascending=not descending, kind="stable", na_position="last").index
+    return order[start:stop]
+
+
+def paged_table(frame, key, columns=None, **kwargs):
+    """
+    st.dataframe of one page of frame, with sorting and paging done here.
+
+    Only the rows of the current page (and `columns`, all by default) are
+    serialized, so the payload stays the same size however many rows match; a
+    caption gives the total. Extra keyword arguments go to st.dataframe.
+    """
+    columns = list(frame.columns if columns is None else columns)
+    pages = max(1, math.ceil(len(frame) / PAGE_ROWS))
+    sort_column, order_column, page_column = st.columns(3)
+    sort_by = sort_column.selectbox("Sort by", [None] + columns, key=f"{key}_sort",
+                                    format_func=lambda column: "(unsorted)" if column is None else column)
+    descending = order_column.toggle("Descending", key=f"{key}_descending")
+    page = page_column.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    rows = page_rows(frame, min(page, pages) - 1, PAGE_ROWS, sort_by, descending)
+    st.dataframe(frame.iloc[rows][columns], **kwargs)
+    first = (min(page, pages) - 1) * PAGE_ROWS
+    st.caption(f"Rows {min(first + 1, len(frame)):,}-{first + len(rows):,} of {len(frame):,}")
@@ -0,0 +1,190 @@
+import os
+
+import pandas as pd
+import pytest
+
+from aws_bench import LocalS3Client
+from aws_data import PLAN_CLASSIFIERS, DatasetCache, apply_schema, classify_plans, read_csv_response
+
+BUCKET = "bucket"
+
+
+class RecordingS3Client(LocalS3Client):
+    """LocalS3Client keeping the keyword arguments of every get_object call."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.gets = []
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self.gets.append(kwargs)
+        return super().get_object(Bucket, Key, **kwargs)
+
+
+def write(root, key, frame):
+    path = os.path.join(root, BUCKET, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    frame.to_csv(path, index=False)
+
+
+def append(root, key, frame):
+    with open(os.path.join(root, BUCKET, key), "a", newline="") as handle:
+        frame.to_csv(handle, index=False, header=False)
+
+
+def parser(schema=None):
+    return lambda response, columns=None: apply_schema(read_csv_response(response, schema, columns), schema)
+
+
+def frame(start, rows):
+    return pd.DataFrame({"id": range(start, start + rows), "amount": [1.5] * rows, "name": ["x"] * rows})
+
+
+@pytest.fixture
+def s3(tmp_path):
+    return RecordingS3Client(str(tmp_path))
+
+
+def test_fresh_entry_is_served_without_a_request(s3):
+    write(s3.root, "a.csv", frame(0, 10))
+    cache = DatasetCache(ttl=60)
+    first = cache.get(s3, BUCKET, "a.csv", parser())
+    second = cache.get(s3, BUCKET, "a.csv", parser())
+    assert len(s3.gets) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_expired_entry_is_revalidated_with_its_etag(s3):
+    write(s3.root, "a.csv", frame(0, 10))
+    cache = DatasetCache(ttl=0)
+    cache.get(s3, BUCKET, "a.csv", parser())
+    etag = cache._entries[(BUCKET, "a.csv")].etag
+    parsed = []
+    cache.get(s3, BUCKET, "a.csv", lambda response, columns=None: parsed.append(1))
+    assert s3.gets[-1] == {"IfNoneMatch": etag}
+    assert not parsed
+
+
+def test_expired_entry_is_reloaded_when_the_object_changed(s3):
+    write(s3.root, "a.csv", frame(0, 10))
+    cache = DatasetCache(ttl=0)
+    cache.get(s3, BUCKET, "a.csv", parser())
+    write(s3.root, "a.csv", frame(0, 25))
+    assert len(cache.get(s3, BUCKET, "a.csv", parser())) == 25
+
+
+def test_least_recently_used_entry_is_evicted(s3):
+    for key in ("a.csv", "b.csv", "c.csv"):
+        write(s3.root, key, frame(0, 100))
+    nbytes = int(frame(0, 100).memory_usage(deep=True).sum())
+    cache = DatasetCache(ttl=60, max_bytes=2 * nbytes)
+    cache.get(s3, BUCKET, "a.csv", parser())
+    cache.get(s3, BUCKET, "b.csv", parser())
+    cache.get(s3, BUCKET, "a.csv", parser())
+    cache.get(s3, BUCKET, "c.csv", parser())
+    assert list(cache._entries) == [(BUCKET, "a.csv"), (BUCKET, "c.csv")]
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_frame_over_the_budget_does_not_evict_the_others(s3):
+    write(s3.root, "small.csv", frame(0, 10))
+    write(s3.root, "large.csv", frame(0, 10_000))
+    nbytes = int(frame(0, 10).memory_usage(deep=True).sum())
+    cache = DatasetCache(ttl=60, max_bytes=4 * nbytes)
+    cache.get(s3, BUCKET, "small.csv", parser())
+    assert len(cache.get(s3, BUCKET, "large.csv", parser())) == 10_000
+    assert list(cache._entries) == [(BUCKET, "small.csv")]
+
+
+def test_projected_entry_is_widened_to_the_union_of_columns(s3):
+    write(s3.root, "a.csv", frame(0, 10))
+    cache = DatasetCache(ttl=60)
+    assert list(cache.get(s3, BUCKET, "a.csv", parser(), columns=frozenset({"id"}))) == ["id"]
+    widened = cache.get(s3, BUCKET, "a.csv", parser(), columns=frozenset({"amount"}))
+    assert list(widened) == ["id", "amount"]
+    assert cache._entries[(BUCKET, "a.csv")].columns == {"id", "amount"}
+    requests = len(s3.gets)
+    cache.get(s3, BUCKET, "a.csv", parser(), columns=frozenset({"id"}))
+    assert len(s3.gets) == requests
+
+
+def test_refresh_keeps_the_projected_columns(s3):
+    write(s3.root, "a.csv", frame(0, 10))
+    cache = DatasetCache(ttl=60)
+    cache.get(s3, BUCKET, "a.csv", parser(), columns=frozenset({"id"}))
+    write(s3.root, "a.csv", frame(0, 20))
+    refreshed = cache.refresh(s3, BUCKET, "a.csv", parser())
+    assert list(refreshed) == ["id"] and len(refreshed) == 20
+    assert cache.refresh(s3, BUCKET, "missing.csv", parser()) is None
+
+
+def test_append_only_csv_reads_only_the_new_bytes(s3):
+    schema = {"sort_by": "id", "append_only": True}
+    write(s3.root, "a.csv", frame(0, 500))
+    cache = DatasetCache(ttl=0)
+    cache.get(s3, BUCKET, "a.csv", parser(schema), schema)
+    previous = cache._entries[(BUCKET, "a.csv")].frame
+    append(s3.root, "a.csv", frame(500, 20))
+    loaded = cache.get(s3, BUCKET, "a.csv", parser(schema), schema)
+    assert "Range" in s3.gets[-1]
+    assert loaded["id"].tolist() == list(range(520))
+    version, rows = cache.appended(loaded.attrs["version"])
+    assert version == previous.attrs["version"]
+    assert rows["id"].tolist() == list(range(500, 520))
+
+
+def test_append_only_csv_rewritten_at_its_tail_is_reloaded(s3):
+    schema = {"sort_by": "id", "append_only": True}
+    write(s3.root, "a.csv", frame(0, 500))
+    cache = DatasetCache(ttl=0)
+    cache.get(s3, BUCKET, "a.csv", parser(schema), schema)
+    rewritten = frame(0, 520)
+    rewritten.loc[499, "name"] = "y"
+    write(s3.root, "a.csv", rewritten)
+    loaded = cache.get(s3, BUCKET, "a.csv", parser(schema), schema)
+    assert "Range" not in s3.gets[-1]
+    assert loaded.loc[499, "name"] == "y" and len(loaded) == 520
+    assert cache.appended(loaded.attrs["version"]) is None
+
+
+@pytest.mark.parametrize("description, plan_family, billing_period, item_kind", [
+    ("BrainTap Monthly Subscription", "retail", "monthly", "subscription"),
+    ("BrainTap Yearly Subscription", "retail", "yearly", "subscription"),
+    ("Legacy Monthly Plan", "legacy", "monthly", "other"),
+    ("Professional Yearly", "partner", "yearly", "other"),
+    # First match wins: each row gets exactly one label per column
+    ("Legacy Promo Monthly", "legacy", "monthly", "other"),
+    ("Legacy Professional Yearly", "legacy", "yearly", "other"),
+    ("Promo BrainTap Monthly Subscription", "promo", "monthly", "subscription"),
+    ("BrainTap 12 month / 1 Year Subscription", "retail", "monthly", "subscription"),
+    ("BrainTap Headset Subscription Bundle", "retail", "none", "product"),
+    # Lower-case period and subscription words are matched too
+    ("promo yearly", "promo", "yearly", "other"),
+    ("professional month-to-month subscription", "other", "monthly", "subscription"),
+    ("Charging Cable", "other", "none", "accessory"),
+    ("Headphones", "other", "none", "product"),
+])
+def test_plan_classification(description, plan_family, billing_period, item_kind):
+    derived = classify_plans(pd.Series([description, None]))
+    assert [derived[name][0] for name in PLAN_CLASSIFIERS] == [plan_family, billing_period, item_kind]
+    assert all(pd.isna(derived[name][1]) for name in PLAN_CLASSIFIERS)
+
+
+def test_append_only_csv_changed_after_its_head_is_reloaded(s3):
+    schema = {"sort_by": "id", "append_only": True}
+    write(s3.root, "a.csv", frame(0, 500))
+    cache = DatasetCache(ttl=0)
+    cache.get(s3, BUCKET, "a.csv", parser(schema), schema)
+    append(s3.root, "a.csv", frame(500, 20))
+    head_object = s3.head_object
+
+    def head_then_rewrite(Bucket, Key, **kwargs):
+        # The object is replaced between the HEAD and the ranged GET
+        head = head_object(Bucket, Key, **kwargs)
+        write(s3.root, "a.csv", frame(0, 600))
+        return head
+
+    s3.head_object = head_then_rewrite
+    loaded = cache.get(s3, BUCKET, "a.csv", parser(schema), schema)
+    assert "IfMatch" in s3.gets[-2] and "Range" not in s3.gets[-1]
+    assert len(loaded) == 600
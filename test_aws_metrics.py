@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aws_data import DERIVED_MAX_BYTES, DerivedCache, estimate_nbytes
+from aws_metrics import TrigramIndex
+
+
+def emails(rows, seed=0):
+    numbers = np.random.default_rng(seed).integers(0, rows, rows)
+    return pd.Series([f"Member{number}@Example.com" for number in numbers])
+
+
+@pytest.mark.parametrize("term", ["m", "EX", "mem", "ber1", "r12@example", "example.com", "nobody", "1@e"])
+def test_trigram_search_matches_a_literal_scan(term):
+    values = emails(5_000).where(lambda series: series.index % 50 != 0)
+    index = TrigramIndex(values)
+    expected = np.flatnonzero(values.str.contains(term, case=False, regex=False, na=False))
+    assert np.array_equal(np.sort(index.positions(values, term)), expected)
+
+
+def test_trigram_search_over_a_subset_of_rows():
+    values = emails(1_000)
+    frame = pd.DataFrame({"email": values}, index=pd.RangeIndex(1_000) * 2)
+    index = TrigramIndex(frame["email"])
+    rows = frame.iloc[100:300]
+    mask = index.matches(frame["email"], rows, "member1")
+    assert mask.tolist() == rows["email"].str.contains("member1", case=False, regex=False).tolist()
+
+
+def test_million_row_index_fits_the_derived_budget_and_is_reused():
+    values = emails(1_000_000)
+    cache, builds = DerivedCache(), []
+    build = lambda: builds.append(1) or TrigramIndex(values)
+    index = cache.get(("search_index", "email"), build)
+    assert estimate_nbytes(index) < DERIVED_MAX_BYTES // 2
+    assert cache.get(("search_index", "email"), build) is index
+    assert len(builds) == 1
+    assert len(index.positions(values, "member12345@")) > 0